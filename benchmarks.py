@@ -0,0 +1,276 @@
+"""Бенчмарки этапов lab1.py на синтетических данных.
+
+Генератор создаёт файл со схемой titanic.csv и распределениями,
+взятыми из эталонного файла (доли классов, пол и выживаемость по
+классам, возраст и стоимость билета по группам, доля пропусков Age и
+бесплатных билетов), любого размера от 10^3 до 10^8 строк - запись идёт
+частями. Каждый этап конвейера замеряется отдельно: время и пиковый
+прирост памяти (tracemalloc). Результаты сохраняются в JSON, сравнение
+с эталонным запуском выявляет регрессии сверх порога.
+
+Запуск:
+    python benchmarks.py --rows 1000 100000 --output bench.json
+    python benchmarks.py --rows 100000 --baseline bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import lab1
+from outliers import OutlierClipper
+from profiling import profile_frame
+
+# Размеры данных по умолчанию (строк)
+DEFAULT_ROWS = [10 ** 3, 10 ** 4, 10 ** 5]
+
+# Размер части при генерации файла
+GENERATE_CHUNK = 1_000_000
+
+# Допустимое замедление относительно эталонного запуска (доля)
+REGRESSION_THRESHOLD = 0.10
+
+STAGES = ['load', 'profile', 'impute', 'stats', 'correlation', 'outliers', 'features', 'export']
+
+
+# =============================================================================
+# СИНТЕТИЧЕСКИЕ ДАННЫЕ
+# =============================================================================
+
+class ManifestGenerator:
+    """Генератор пассажиров с распределениями эталонного файла.
+
+    age_nan_rate и zero_fare_rate по умолчанию берутся из эталона, но
+    могут быть заданы явно (например, 0.2 пропусков Age, как в полном
+    наборе данных Титаника).
+    """
+
+    def __init__(self, reference=lab1.INPUT_PATH, age_nan_rate=None, zero_fare_rate=None, seed=0):
+        ref = pd.read_csv(reference)
+        self.columns = list(ref.columns)
+        self.rng = np.random.default_rng(seed)
+        self.classes = np.sort(ref['Pclass'].unique())
+        self.class_probs = ref['Pclass'].value_counts(normalize=True).reindex(self.classes).to_numpy()
+        self.age_nan_rate = ref['Age'].isna().mean() if age_nan_rate is None else age_nan_rate
+        self.zero_fare_rate = (ref['Fare'] == 0).mean() if zero_fare_rate is None else zero_fare_rate
+        self.names = ref['Name'].to_numpy(dtype=object)
+
+        # Условные распределения по классу (и полу)
+        self.by_class = {}
+        for pclass, group in ref.groupby('Pclass'):
+            fares = group.loc[group['Fare'] > 0, 'Fare'].to_numpy()
+            self.by_class[pclass] = {
+                'female_share': (group['Sex'] == 'female').mean(),
+                'relatives': group[['Siblings/Spouses Aboard', 'Parents/Children Aboard']].to_numpy(),
+                'fares': fares if len(fares) else group['Fare'].to_numpy(),
+            }
+        self.by_sex_class = {}
+        for (sex, pclass), group in ref.groupby(['Sex', 'Pclass']):
+            self.by_sex_class[(sex, pclass)] = {
+                'ages': group['Age'].dropna().to_numpy(),
+                'survival': group['Survived'].mean(),
+            }
+
+    def generate(self, n_rows):
+        """DataFrame из n_rows синтетических пассажиров"""
+        rng = self.rng
+        pclass = rng.choice(self.classes, size=n_rows, p=self.class_probs)
+        sex = np.empty(n_rows, dtype=object)
+        age = np.empty(n_rows)
+        survived = np.empty(n_rows, dtype='int64')
+        relatives = np.empty((n_rows, 2), dtype='int64')
+        fare = np.empty(n_rows)
+
+        for cls, params in self.by_class.items():
+            idx = np.flatnonzero(pclass == cls)
+            sex[idx] = np.where(rng.random(len(idx)) < params['female_share'], 'female', 'male')
+            relatives[idx] = params['relatives'][rng.integers(0, len(params['relatives']), len(idx))]
+            fare[idx] = rng.choice(params['fares'], size=len(idx))
+
+        for (sx, cls), params in self.by_sex_class.items():
+            idx = np.flatnonzero((pclass == cls) & (sex == sx))
+            age[idx] = rng.choice(params['ages'], size=len(idx))
+            survived[idx] = rng.random(len(idx)) < params['survival']
+
+        age[rng.random(n_rows) < self.age_nan_rate] = np.nan
+        fare[rng.random(n_rows) < self.zero_fare_rate] = 0.0
+
+        df = pd.DataFrame({
+            'Survived': survived,
+            'Pclass': pclass,
+            'Name': rng.choice(self.names, size=n_rows),
+            'Sex': sex,
+            'Age': age,
+            'Siblings/Spouses Aboard': relatives[:, 0],
+            'Parents/Children Aboard': relatives[:, 1],
+            'Fare': fare,
+        })
+        return df[self.columns]
+
+    def write_csv(self, path, n_rows, chunk_size=GENERATE_CHUNK):
+        """Запись n_rows пассажиров в CSV частями по chunk_size строк"""
+        written = 0
+        while written < n_rows:
+            size = min(chunk_size, n_rows - written)
+            self.generate(size).to_csv(path, mode='w' if written == 0 else 'a',
+                                       header=written == 0, index=False)
+            written += size
+        return path
+
+
+# =============================================================================
+# ЗАМЕРЫ
+# =============================================================================
+
+def measure(func, *args):
+    """Выполнение func(*args): (результат, секунды)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def measure_memory(func, *args):
+    """Пиковый прирост памяти (байт) при выполнении func(*args).
+
+    Замер идёт отдельным запуском: tracemalloc сильно замедляет
+    код с большим числом мелких выделений памяти и искажает время.
+    """
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _stats(df_processed):
+    return df_processed.describe(), lab1.survival_stats(df_processed)
+
+
+def _features(df_processed, clipper):
+    # Новая копия на каждый запуск: признаки вычисляются на месте, а уже
+    # имеющиеся столбцы реестр пропускает
+    df_processed, _ = lab1.clip_outliers(df_processed.copy(), clipper)
+    return lab1.engineer_features(df_processed)
+
+
+def benchmark_file(path, repeat=1):
+    """Замер всех этапов конвейера на файле path.
+
+    Для каждого этапа берётся лучшее время из repeat запусков, память
+    замеряется ещё одним запуском под tracemalloc.
+    Возвращает {этап: {'seconds': ..., 'peak_bytes': ...}}.
+    """
+    results = {}
+
+    def run(stage, func, *args):
+        timings = []
+        for _ in range(repeat):
+            result, seconds = measure(func, *args)
+            timings.append(seconds)
+        results[stage] = {'seconds': min(timings), 'peak_bytes': measure_memory(func, *args)}
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df = run('load', lab1.load_data, path)
+        run('profile', profile_frame, df)
+        df_processed = run('impute', lab1.impute_missing, df)
+        run('stats', _stats, df_processed)
+        run('correlation', lab1.correlation_matrix, df_processed)
+        clipper = run('outliers', OutlierClipper().fit, df_processed)
+        df_processed = run('features', _features, df_processed, clipper)
+        run('export', lab1.export_data, df_processed, os.path.join(tmp, 'processed.csv'))
+    return results
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, repeat=1, reference=lab1.INPUT_PATH, age_nan_rate=None, seed=0):
+    """Генерация данных каждого размера и замер этапов, результат для JSON"""
+    generator = ManifestGenerator(reference, age_nan_rate=age_nan_rate, seed=seed)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+        },
+        'runs': {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in rows:
+            path = generator.write_csv(os.path.join(tmp, f'manifest_{n_rows}.csv'), n_rows)
+            report['runs'][str(n_rows)] = benchmark_file(path, repeat)
+            os.remove(path)
+    return report
+
+
+def find_regressions(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Этапы, замедлившиеся более чем на threshold относительно baseline"""
+    regressions = []
+    for n_rows, stages in current['runs'].items():
+        for stage, result in stages.items():
+            base = baseline.get('runs', {}).get(n_rows, {}).get(stage)
+            if base and result['seconds'] > base['seconds'] * (1 + threshold):
+                regressions.append({
+                    'rows': int(n_rows),
+                    'stage': stage,
+                    'baseline': base['seconds'],
+                    'current': result['seconds'],
+                    'slowdown': result['seconds'] / base['seconds'] - 1,
+                })
+    return regressions
+
+
+def print_results(report):
+    for n_rows, stages in report['runs'].items():
+        print(f"\nСтрок: {int(n_rows):,}".replace(',', ' '))
+        for stage in STAGES:
+            result = stages[stage]
+            print(f"  {stage:<12} {result['seconds'] * 1000:10.1f} мс  {result['peak_bytes'] / 1024 ** 2:10.2f} МБ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарки этапов lab1.py на синтетических данных')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help='размеры данных (строк)')
+    parser.add_argument('--repeat', type=int, default=1, help='число повторов каждого этапа')
+    parser.add_argument('--reference', default=lab1.INPUT_PATH, help='эталонный файл распределений')
+    parser.add_argument('--age-nan-rate', type=float, help='доля пропусков Age (по умолчанию как в эталоне)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='файл для результатов в JSON')
+    parser.add_argument('--baseline', help='JSON эталонного запуска для проверки регрессий')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='допустимое замедление (доля, по умолчанию 0.10)')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.rows, args.repeat, args.reference, args.age_nan_rate, args.seed)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Результаты сохранены в файл: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n❌ Регрессии (порог {args.threshold:.0%}):")
+            for item in regressions:
+                print(f"  {item['rows']} строк, {item['stage']}: {item['baseline'] * 1000:.1f} мс -> "
+                      f"{item['current'] * 1000:.1f} мс (+{item['slowdown']:.0%})")
+            sys.exit(1)
+        print(f"\n✅ Регрессий нет (порог {args.threshold:.0%})")
+
+
+if __name__ == '__main__':
+    main()
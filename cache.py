@@ -0,0 +1,103 @@
+"""Кэш результатов анализа на диске с адресацией по содержимому.
+
+Ключ кэша - SHA-256 содержимого входного файла вместе с параметрами
+конвейера (возрастные группы, множитель IQR, ключи группировки), поэтому
+неизменный файл с теми же параметрами даёт попадание в кэш независимо
+от имени и времени изменения файла. Промежуточные и итоговые результаты
+хранятся отдельными pickle-файлами; при превышении лимита размера
+удаляются давно не использованные файлы (LRU).
+"""
+import hashlib
+import json
+import os
+import pickle
+
+# Лимит размера кэша по умолчанию (байт)
+MAX_CACHE_BYTES = 1024 ** 3
+
+# Размер блока при хешировании файла
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 содержимого файла (читается блоками) или всех файлов каталога (colstore)"""
+    digest = hashlib.sha256()
+    paths = [path]
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+    for file_path in paths:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Каталог с результатами вида <ключ>/<имя>.pkl и счётчиками попаданий"""
+
+    def __init__(self, directory, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, path, params):
+        """Ключ по содержимому входного файла и параметрам конвейера"""
+        digest = hashlib.sha256(file_digest(path).encode())
+        digest.update(json.dumps(params, sort_keys=True, ensure_ascii=False, default=str).encode())
+        return digest.hexdigest()
+
+    def _path(self, key, name):
+        return os.path.join(self.directory, key, f'{name}.pkl')
+
+    def get(self, key, name, default=None):
+        path = self._path(key, name)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return default
+        # Время изменения файла используется как время последнего доступа для LRU
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, name, value):
+        path = self._path(key, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+        return value
+
+    def get_or_compute(self, key, name, compute):
+        """Значение из кэша или результат compute(), сохранённый в кэш"""
+        missing = object()
+        value = self.get(key, name, missing)
+        if value is missing:
+            value = self.put(key, name, compute())
+        return value
+
+    def evict(self):
+        """Удаление давно не использованных файлов сверх лимита размера"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if file_name.endswith('.pkl'):
+                    path = os.path.join(root, file_name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
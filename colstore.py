@@ -0,0 +1,174 @@
+"""Колоночное хранилище: каталог файлов NumPy, отображаемых в память.
+
+Исходный CSV-файл один раз преобразуется (ingest) в каталог с
+расширением .cols: каждый столбец - отдельный файл .npy фиксированной
+ширины. Текстовые столбцы (Name, Sex) кодируются словарём: коды строк
+(int8/int16/int32) и отдельный файл словаря. Для столбцов с пропусками
+(Age) записывается битовая маска заполненных значений; сами значения
+хранятся с NaN, чтобы их можно было читать без копирования.
+
+Чтение не разбирает текст: файлы открываются через np.load(mmap_mode='r'),
+DataFrame собирается из отображённых массивов без копирования, текстовые
+столбцы возвращаются как category поверх кодов. Читаются только нужные
+столбцы и, при необходимости, диапазон строк; несколько процессов,
+читающих одно хранилище, используют общий страничный кэш ОС.
+
+Запуск:
+    python colstore.py titanic.csv titanic.cols
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+META_FILE = 'meta.json'
+VERSION = 1
+
+
+def _column_data(values):
+    """Описание и массивы столбца для записи: (метаданные, {суффикс файла: массив})"""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) \
+            or pd.api.types.is_string_dtype(dtype):
+        categorical = values if isinstance(dtype, pd.CategoricalDtype) else values.astype('category')
+        codes = categorical.cat.codes.to_numpy()
+        valid = codes >= 0
+        meta = {'kind': 'dictionary', 'ordered': bool(categorical.cat.ordered)}
+        categories = categorical.cat.categories
+        arrays = {'': codes, '.dict': categories.to_numpy(dtype=str if categories.dtype == object else None)}
+    else:
+        if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            # Целые и логические с пропусками (Int8, boolean) - как float64 с NaN
+            if values.isna().any():
+                array = values.to_numpy(dtype='float64', na_value=np.nan)
+            else:
+                array = values.to_numpy(dtype=dtype.numpy_dtype)
+        else:
+            array = values.to_numpy()
+        valid = ~np.isnan(array) if array.dtype.kind == 'f' else np.ones(len(array), dtype=bool)
+        meta = {'kind': 'values'}
+        arrays = {'': array}
+    meta['dtype'] = str(arrays[''].dtype)
+    meta['nulls'] = int(len(valid) - np.count_nonzero(valid))
+    if meta['nulls']:
+        arrays['.valid'] = np.packbits(valid, bitorder='little')
+    return meta, arrays
+
+
+def write_store(df, path):
+    """Запись df в каталог path (существующее хранилище заменяется)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    os.makedirs(tmp_path)
+    columns = []
+    for i, col in enumerate(df.columns):
+        meta, arrays = _column_data(df[col])
+        meta['name'] = col
+        meta['file'] = f'c{i:03d}'
+        for suffix, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{meta['file']}{suffix}.npy"), array, allow_pickle=False)
+        columns.append(meta)
+    with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'version': VERSION, 'rows': len(df), 'columns': columns}, f, ensure_ascii=False, indent=2)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def ingest(csv_path, path=None):
+    """Однократное преобразование CSV-файла в хранилище (по умолчанию рядом, с расширением .cols)"""
+    if path is None:
+        path = os.path.splitext(csv_path)[0] + '.cols'
+    return write_store(pd.read_csv(csv_path), path)
+
+
+class ColumnStore:
+    """Открытое хранилище: столбцы читаются по запросу, без копирования"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['version'] != VERSION:
+            raise ValueError(f"Неподдерживаемая версия хранилища {meta['version']} в '{path}'")
+        self.path = path
+        self.rows = meta['rows']
+        self.meta = {column['name']: column for column in meta['columns']}
+        self.columns = list(self.meta)
+        self._dictionaries = {}
+
+    def _load(self, col, suffix=''):
+        return np.load(os.path.join(self.path, f"{self.meta[col]['file']}{suffix}.npy"), mmap_mode='r')
+
+    def _meta(self, col):
+        if col not in self.meta:
+            raise KeyError(f"Столбец '{col}' отсутствует в хранилище, доступны: {', '.join(self.columns)}")
+        return self.meta[col]
+
+    def dictionary(self, col):
+        """Тип category со словарём текстового столбца"""
+        if col not in self._dictionaries:
+            meta = self._meta(col)
+            self._dictionaries[col] = pd.CategoricalDtype(pd.Index(self._load(col, '.dict').tolist()),
+                                                          ordered=meta['ordered'])
+        return self._dictionaries[col]
+
+    def column(self, col, start=0, stop=None):
+        """Значения столбца в строках [start, stop): массив NumPy или Categorical"""
+        meta = self._meta(col)
+        values = self._load(col)[start:stop]
+        if meta['kind'] == 'dictionary':
+            return pd.Categorical.from_codes(values, dtype=self.dictionary(col), validate=False)
+        return values
+
+    def validity(self, col, start=0, stop=None):
+        """Маска заполненных значений столбца (по битовой маске, без просмотра значений)"""
+        meta = self._meta(col)
+        stop = self.rows if stop is None else min(stop, self.rows)
+        if not meta['nulls']:
+            return np.ones(max(stop - start, 0), dtype=bool)
+        return np.unpackbits(self._load(col, '.valid'), count=self.rows, bitorder='little')[start:stop].view(bool)
+
+    def null_counts(self):
+        """Число пропусков в каждом столбце (из метаданных)"""
+        return pd.Series({col: meta['nulls'] for col, meta in self.meta.items()}, dtype='int64')
+
+    def read(self, columns=None, start=0, stop=None):
+        """DataFrame из столбцов columns и строк [start, stop) без копирования данных"""
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame({col: self.column(col, start, stop) for col in columns}, copy=False)
+
+
+def read_store(path, columns=None, start=0, stop=None):
+    """Чтение хранилища path (только столбцы columns и строки [start, stop))"""
+    return ColumnStore(path).read(columns, start, stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Преобразование CSV-файла в колоночное хранилище')
+    parser.add_argument('path', help='исходный CSV-файл')
+    parser.add_argument('output', nargs='?', help='каталог хранилища (по умолчанию <имя>.cols)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = ingest(args.path, args.output)
+    elapsed = time.perf_counter() - start
+    store = ColumnStore(path)
+    size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    print(f"✓ Хранилище {path}: {store.rows} строк, {len(store.columns)} столбцов, "
+          f"{size / 1024 ** 2:.2f} МБ, преобразование {elapsed:.2f} с")
+    for col, meta in store.meta.items():
+        encoding = 'словарь' if meta['kind'] == 'dictionary' else 'значения'
+        nulls = f", пропусков: {meta['nulls']}" if meta['nulls'] else ''
+        print(f"  {col}: {meta['dtype']} ({encoding}){nulls}")
+
+    start = time.perf_counter()
+    read_store(path)
+    print(f"✓ Открытие хранилища: {(time.perf_counter() - start) * 1000:.2f} мс")
+
+
+if __name__ == '__main__':
+    main()
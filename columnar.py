@@ -0,0 +1,106 @@
+"""Колоночные форматы Parquet и Feather (Arrow IPC) с явной схемой.
+
+Формат файла определяется по расширению: .parquet, .feather/.arrow,
+.cols (каталог colstore с файлами NumPy) или .csv. Перед записью в
+Parquet и Feather столбцы приводятся к схеме PROCESSED_SCHEMA (bool,
+category, узкие целые), поэтому при чтении типы восстанавливаются без
+повторного разбора строк. Чтение поддерживает отображение файла в память
+(memory_map) и загрузку только нужных столбцов (columns).
+Для Parquet и Feather требуется пакет pyarrow.
+"""
+import os
+
+import pandas as pd
+
+from colstore import read_store, write_store
+
+# Схема исходных и обработанных данных
+PROCESSED_SCHEMA = {
+    'Survived': 'uint8',
+    'Pclass': 'uint8',
+    'Name': 'object',
+    'Sex': 'category',
+    'Age': 'float64',
+    'Siblings/Spouses Aboard': 'uint8',
+    'Parents/Children Aboard': 'uint8',
+    'Fare': 'float64',
+    'Age_processed': 'float64',
+    'Fare_log': 'float64',
+    'Fare_processed': 'float64',
+    'IsChild': 'bool',
+    'TotalRelatives': 'uint8',
+    'AgeGroup': 'category',
+}
+
+# Целые типы, допускающие пропуски (используются при наличии NaN)
+NULLABLE_INTS = {'int8': 'Int8', 'uint8': 'UInt8', 'int16': 'Int16', 'uint16': 'UInt16',
+                 'int32': 'Int32', 'uint32': 'UInt32', 'int64': 'Int64'}
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.cols': 'colstore',
+    '.csv': 'csv',
+}
+
+
+def file_format(path):
+    """Формат файла по расширению"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Неизвестный формат файла '{path}', допустимые расширения: {', '.join(FORMATS)}")
+    return FORMATS[ext]
+
+
+def apply_schema(df, schema=PROCESSED_SCHEMA):
+    """Приведение столбцов df к типам схемы (новый DataFrame)"""
+    dtypes = {}
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, str) and dtype in NULLABLE_INTS and df[col].isna().any():
+            dtype = NULLABLE_INTS[dtype]
+        elif dtype == 'bool' and df[col].isna().any():
+            dtype = 'boolean'
+        dtypes[col] = dtype
+    return df.astype(dtypes)
+
+
+def write_table(df, path, schema=PROCESSED_SCHEMA, compression=None):
+    """Запись df в файл формата по расширению path.
+
+    Для Feather по умолчанию сжатие отключено, чтобы файл можно было
+    отображать в память без копирования; для Parquet - snappy.
+    """
+    fmt = file_format(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+        return path
+    if fmt == 'colstore':
+        return write_store(df, path)
+    typed = apply_schema(df, schema)
+    if fmt == 'parquet':
+        typed.to_parquet(path, engine='pyarrow', index=False, compression=compression or 'snappy')
+    else:
+        typed.reset_index(drop=True).to_feather(path, compression=compression or 'uncompressed')
+    return path
+
+
+def read_table(path, columns=None, memory_map=True):
+    """Чтение файла с загрузкой только столбцов columns"""
+    fmt = file_format(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, usecols=columns)
+    if fmt == 'colstore':
+        return read_store(path, columns)
+
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if fmt == 'parquet':
+        table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
@@ -0,0 +1,64 @@
+"""Компактные типы данных при загрузке.
+
+План типов строится по фактическим значениям столбцов: целые числа
+понижаются до наименьшего подходящего типа (uint8/int8 и т.д.),
+текстовые столбцы с небольшим числом различных значений (Sex, AgeGroup)
+хранятся как category, остальные строки (Name) - по желанию как строки
+Arrow. Возвращается также расход памяти до и после преобразования.
+"""
+import numpy as np
+import pandas as pd
+
+# Текст считается категориальным, если различных значений не больше этой доли строк
+CATEGORY_RATIO = 0.5
+
+# Целые типы в порядке возрастания размера
+INT_TYPES = ['uint8', 'int8', 'uint16', 'int16', 'uint32', 'int32', 'uint64', 'int64']
+
+
+def memory_usage(df):
+    """Полный расход памяти DataFrame в байтах (с учётом строк)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _smallest_int(values):
+    """Наименьший целый тип, вмещающий все значения"""
+    lo, hi = values.min(), values.max()
+    for dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return str(values.dtype)
+
+
+def plan_dtypes(df, arrow_strings=False, category_ratio=CATEGORY_RATIO):
+    """План компактных типов: {столбец: тип} только для изменяемых столбцов"""
+    plan = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = values.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            if len(values) > 0:
+                target = _smallest_int(values)
+                if target != str(dtype):
+                    plan[col] = target
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if len(values) > 0 and values.nunique(dropna=True) <= category_ratio * len(values):
+                plan[col] = 'category'
+            elif arrow_strings:
+                plan[col] = 'string[pyarrow]'
+    return plan
+
+
+def compact_frame(df, arrow_strings=False, plan=None):
+    """Преобразование df по плану типов.
+
+    Возвращает (новый DataFrame, план, байт до, байт после).
+    """
+    before = memory_usage(df)
+    if plan is None:
+        plan = plan_dtypes(df, arrow_strings)
+    compacted = df.astype(plan) if plan else df
+    return compacted, plan, before, memory_usage(compacted)
@@ -0,0 +1,149 @@
+"""Матрицы корреляций: объединяемые статистики Пирсона, Спирмен и точечно-бисериальная.
+
+Для каждой пары столбцов хранятся число строк, где заполнены оба
+значения, средние и центрированные суммы произведений (co-moments).
+Части данных обрабатываются независимо и объединяются по формулам Чана,
+поэтому результат совпадает с DataFrame.corr() (попарное исключение
+пропусков) для данных, разбитых на любое число частей, и его можно
+считать по исходным данным с пропусками. Матрица строится по массиву
+числовых столбцов без копии DataFrame с переименованными столбцами.
+
+Корреляции Спирмена и точечно-бисериальная (с p-значениями) считаются
+через scipy.stats, который загружается только при их вызове. Ранги
+требуют всех данных сразу, поэтому эти варианты не объединяются по частям.
+"""
+import numpy as np
+import pandas as pd
+
+# Размер части строк при накоплении статистик по большому DataFrame
+CHUNK_ROWS = 100_000
+
+METHODS = ('pearson', 'spearman')
+
+
+def numeric_columns(df):
+    """Числовые столбцы df (без bool), как select_dtypes(include=[np.number])"""
+    return [col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype)]
+
+
+class CorrelationStats:
+    """Накопление попарных статистик по частям DataFrame"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        p = len(self.columns)
+        # n[i, j] - строк, где заполнены i и j; mean[i, j] - среднее i по этим строкам;
+        # comoment[i, j] - сумма (x_i - mean_i)(x_j - mean_j); m2[i, j] - сумма (x_i - mean_i)^2
+        self.n = np.zeros((p, p))
+        self.mean = np.zeros((p, p))
+        self.comoment = np.zeros((p, p))
+        self.m2 = np.zeros((p, p))
+
+    def update(self, df):
+        """Добавление строк df (нужны все столбцы columns)"""
+        values = df[self.columns].to_numpy(dtype='float64')
+        present = ~np.isnan(values)
+        weights = present.astype('float64')
+
+        # Центрирование по средним части уменьшает потерю точности в суммах
+        counts = weights.sum(axis=0)
+        center = np.divide(np.nansum(values, axis=0), counts, out=np.zeros(len(counts)), where=counts > 0)
+        centered = np.where(present, values - center, 0.0)
+
+        n = weights.T @ weights
+        sums = centered.T @ weights
+        mean = np.divide(sums, n, out=np.zeros_like(n), where=n > 0)
+        comoment = centered.T @ centered - sums * mean.T
+        m2 = (centered * centered).T @ weights - sums * mean
+
+        part = CorrelationStats(self.columns)
+        part.n, part.mean, part.comoment, part.m2 = n, mean + center[:, None], comoment, m2
+        return self.merge(part)
+
+    def merge(self, other):
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        weight = np.divide(self.n * other.n, n, out=np.zeros_like(n), where=n > 0)
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.m2 = self.m2 + other.m2 + delta * delta * weight
+        self.mean = self.mean + np.divide(delta * other.n, n, out=np.zeros_like(n), where=n > 0)
+        self.n = n
+        return self
+
+    def corr(self):
+        """Матрица корреляций Пирсона (как DataFrame.corr())"""
+        denominator = np.sqrt(self.m2 * self.m2.T)
+        valid = (self.n > 0) & (denominator > 0)
+        result = np.divide(self.comoment, denominator, out=np.full_like(self.n, np.nan), where=valid)
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
+
+
+def _chunks(df, chunksize):
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def correlation_stats(df, columns=None, chunksize=CHUNK_ROWS):
+    """CorrelationStats по df, накопленные частями по chunksize строк"""
+    stats = CorrelationStats(numeric_columns(df) if columns is None else columns)
+    for chunk in _chunks(df, chunksize):
+        stats.update(chunk)
+    return stats
+
+
+def _spearman(df, columns):
+    from scipy import stats
+
+    values = df[columns].to_numpy(dtype='float64')
+    present = ~np.isnan(values)
+    if present.all():
+        # Без пропусков ранги считаются один раз для всех столбцов
+        ranks = pd.DataFrame(stats.rankdata(values, axis=0), columns=columns)
+        return correlation_stats(ranks, columns).corr()
+    p = len(columns)
+    result = np.full((p, p), np.nan)
+    for i in range(p):
+        for j in range(i, p):
+            mask = present[:, i] & present[:, j]
+            if mask.sum() > 1:
+                x, y = values[mask, i], values[mask, j]
+                if np.ptp(x) > 0 and np.ptp(y) > 0:
+                    result[i, j] = result[j, i] = stats.spearmanr(x, y).statistic
+    return pd.DataFrame(result, index=columns, columns=columns)
+
+
+def correlation_frame(df, method='pearson', columns=None, chunksize=CHUNK_ROWS):
+    """Матрица корреляций числовых столбцов df с попарным исключением пропусков.
+
+    method - 'pearson' (по частям, объединяемые статистики) или 'spearman'.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод корреляции '{method}', допустимые: {', '.join(METHODS)}")
+    columns = numeric_columns(df) if columns is None else list(columns)
+    if method == 'spearman':
+        return _spearman(df, columns)
+    return correlation_stats(df, columns, chunksize).corr()
+
+
+def point_biserial(df, binary='Survived', columns=None):
+    """Точечно-бисериальная корреляция бинарного столбца с числовыми.
+
+    Возвращает DataFrame с коэффициентом r, p-значением и числом строк
+    для каждого столбца (строки с пропусками исключаются попарно).
+    """
+    from scipy import stats
+
+    if columns is None:
+        columns = [col for col in numeric_columns(df) if col != binary]
+    target = df[binary].to_numpy(dtype='float64')
+    rows = {}
+    for col in columns:
+        values = df[col].to_numpy(dtype='float64')
+        mask = ~np.isnan(values) & ~np.isnan(target)
+        if mask.sum() > 2 and np.ptp(values[mask]) > 0 and np.ptp(target[mask]) > 0:
+            result = stats.pointbiserialr(target[mask], values[mask])
+            rows[col] = {'r': result.statistic, 'p_value': result.pvalue, 'count': int(mask.sum())}
+        else:
+            rows[col] = {'r': np.nan, 'p_value': np.nan, 'count': int(mask.sum())}
+    return pd.DataFrame.from_dict(rows, orient='index', columns=['r', 'p_value', 'count'])
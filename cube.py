@@ -0,0 +1,128 @@
+"""Куб выживаемости: число пассажиров и выживших по всем сочетаниям признаков.
+
+Куб строится за один проход по обработанным данным (lab1.engineer_features):
+коды значений каждого измерения сворачиваются в плоский номер ячейки, и
+np.bincount считает число пассажиров и сумму Survived во всех ячейках
+Pclass x Sex x AgeGroup x TotalRelatives x FareBand x IsChild. Любой срез
+(фильтр по значениям) и свёртка (группировка по части измерений) дальше
+считаются по небольшому массиву куба без прохода по строкам.
+
+Пропуск в измерении попадает в отдельную ячейку: он учитывается в
+свёртках по другим измерениям, но не выводится как группа (как
+groupby с dropna=True).
+"""
+import numpy as np
+import pandas as pd
+
+# Диапазоны стоимости билета (FareBand)
+FARE_BINS = [0, 10, 25, 50, 100, np.inf]
+FARE_LABELS = ['<10', '10-25', '25-50', '50-100', '100+']
+
+DIMENSIONS = ['Pclass', 'Sex', 'AgeGroup', 'TotalRelatives', 'FareBand', 'IsChild']
+
+
+def fare_band(fare):
+    """Диапазон стоимости билета для каждого пассажира"""
+    return pd.cut(fare, bins=FARE_BINS, labels=FARE_LABELS, right=False)
+
+
+class SurvivalCube:
+    """Плотный массив (число пассажиров, выживших) по измерениям.
+
+    levels[i] - значения i-го измерения; последняя ячейка каждой оси
+    отведена под пропуски.
+    """
+
+    def __init__(self, dimensions, levels, counts, survived):
+        self.dimensions = list(dimensions)
+        self.levels = list(levels)
+        self.counts = counts
+        self.survived = survived
+        self._positions = [{value: i for i, value in enumerate(level)} for level in self.levels]
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS, target='Survived'):
+        """Построение куба за один проход по df"""
+        codes, levels = [], []
+        for dim in dimensions:
+            values = fare_band(df['Fare']) if dim == 'FareBand' and dim not in df.columns else df[dim]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                code = values.cat.codes.to_numpy()
+                level = pd.CategoricalIndex(values.cat.categories, categories=values.cat.categories,
+                                            ordered=values.cat.ordered, name=dim)
+            else:
+                code, level = pd.factorize(values, sort=True)
+                level = pd.Index(level, name=dim)
+            # Пропуск (-1) - последняя ячейка оси
+            codes.append(np.where(code < 0, len(level), code))
+            levels.append(level)
+
+        shape = tuple(len(level) + 1 for level in levels)
+        cells = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(cells, minlength=size).reshape(shape)
+        survived = np.bincount(cells, weights=df[target].to_numpy(dtype='float64'), minlength=size)
+        return cls(dimensions, levels, counts, survived.astype('int64').reshape(shape))
+
+    def _axis(self, dim):
+        try:
+            return self.dimensions.index(dim)
+        except ValueError:
+            raise KeyError(f"Измерение '{dim}' отсутствует в кубе, доступны: {', '.join(self.dimensions)}") from None
+
+    def _slice(self, filters):
+        """Массивы (counts, survived), ограниченные значениями фильтров, и {ось: выбранные позиции}"""
+        counts, survived = self.counts, self.survived
+        selected = {}
+        for dim, value in filters.items():
+            axis = self._axis(dim)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            positions = np.array([self._positions[axis][v] for v in values if v in self._positions[axis]],
+                                 dtype=np.intp)
+            counts = np.take(counts, positions, axis=axis)
+            survived = np.take(survived, positions, axis=axis)
+            selected[axis] = positions
+        return counts, survived, selected
+
+    def totals(self, **filters):
+        """(выживших, пассажиров) в срезе; значение фильтра - одно значение или список"""
+        counts, survived, _ = self._slice(filters)
+        return int(survived.sum()), int(counts.sum())
+
+    def rate(self, **filters):
+        """Доля выживших в срезе (NaN для пустого среза)"""
+        survived, count = self.totals(**filters)
+        return survived / count if count else np.nan
+
+    def table(self, by, **filters):
+        """Выживаемость по измерениям by в срезе, как groupby(by)['Survived'].agg(['mean', 'count'])"""
+        by = [by] if isinstance(by, str) else list(by)
+        axes = [self._axis(dim) for dim in by]
+        counts, survived, selected = self._slice(filters)
+        other = tuple(axis for axis in range(len(self.dimensions)) if axis not in axes)
+        counts, survived = counts.sum(axis=other), survived.sum(axis=other)
+
+        # Оси результата в порядке by, без ячеек пропусков; отфильтрованные оси
+        # содержат только выбранные позиции
+        order = np.argsort(np.argsort(axes))
+        counts, survived = counts.transpose(order), survived.transpose(order)
+        positions = [selected.get(axis, np.arange(len(self.levels[axis]) + 1)) for axis in axes]
+        keep = [p < len(self.levels[axis]) for p, axis in zip(positions, axes)]
+        counts, survived = counts[np.ix_(*keep)].ravel(), survived[np.ix_(*keep)].ravel()
+
+        levels = [self.levels[axis][p[k]] for p, k, axis in zip(positions, keep, axes)]
+        if len(by) == 1:
+            index = levels[0]
+        else:
+            index = pd.MultiIndex.from_product(levels, names=by)
+        table = pd.DataFrame({'mean': survived / np.where(counts > 0, counts, 1), 'count': counts}, index=index)
+        return table[counts > 0]
+
+    def merge(self, other):
+        """Объединение с кубом другой части данных (с теми же значениями измерений)"""
+        if self.dimensions != other.dimensions or any(
+                not left.equals(right) for left, right in zip(self.levels, other.levels)):
+            raise ValueError("Нельзя объединить кубы с разными измерениями или значениями")
+        self.counts = self.counts + other.counts
+        self.survived = self.survived + other.survived
+        return self
@@ -0,0 +1,190 @@
+"""Реестр производных признаков (раздел 6 lab1.py).
+
+Каждый признак объявляет входные столбцы и векторизованную функцию.
+Реестр сам определяет порядок вычисления по зависимостям (признак может
+зависеть от других признаков), вычисляет каждый признак один раз и
+пропускает уже посчитанные столбцы. Функции получают массивы NumPy
+(для текстовых признаков - Series); если у признака задан dtype, реестр
+выделяет выходной массив и передаёт его как out=, и функция заполняет
+его универсальными функциями NumPy на месте, без промежуточных массивов.
+Новые столбцы добавляются в DataFrame по одному, без копии всей таблицы.
+Промежуточный признак (intermediate=True, например NameParts - все части
+имени) вычисляется один раз за compute() и передаётся зависящим от него
+признакам, но в DataFrame не добавляется.
+
+Новый признак:
+    @FEATURES.register('AgePerClass', ['Age_processed', 'Pclass'], dtype='float64')
+    def age_per_class(age, pclass, out):
+        return np.divide(age, pclass, out=out)
+"""
+import numpy as np
+import pandas as pd
+
+from names import family_ids, parse_names
+
+# Возрастные группы
+AGE_BINS = [0, 12, 18, 35, 60, 100]
+AGE_LABELS = ['Дети (0-12)', 'Подростки (13-18)', 'Молодые (19-35)', 'Взрослые (36-60)', 'Пожилые (60+)']
+
+# Пассажир считается ребёнком младше этого возраста
+CHILD_AGE = 18
+
+# Признаки обработанных данных lab1.py в порядке столбцов
+DEFAULT_FEATURES = ['IsChild', 'TotalRelatives', 'AgeGroup']
+
+
+class Feature:
+    """Производный столбец: входы, функция и (для out=) тип результата"""
+
+    def __init__(self, name, inputs, func, dtype=None, series=False, intermediate=False):
+        self.name = name
+        self.inputs = list(inputs)
+        self.func = func
+        self.dtype = dtype
+        self.series = series
+        self.intermediate = intermediate
+
+    def __call__(self, *values):
+        """Значения признака по значениям входов (массивы или Series)"""
+        if self.series:
+            values = [value if isinstance(value, (pd.Series, pd.DataFrame)) else pd.Series(value) for value in values]
+        else:
+            values = [np.asarray(value) for value in values]
+        if self.dtype is None:
+            return self.func(*values)
+        out = np.empty(len(values[0]), dtype=self.dtype)
+        result = self.func(*values, out=out)
+        return out if result is None else result
+
+
+class FeatureRegistry:
+    """Признаки по именам и вычисление их с учётом зависимостей"""
+
+    def __init__(self, features=()):
+        self.features = {feature.name: feature for feature in features}
+
+    def __contains__(self, name):
+        return name in self.features
+
+    def __getitem__(self, name):
+        return self.features[name]
+
+    def add(self, feature):
+        self.features[feature.name] = feature
+        return feature
+
+    def register(self, name, inputs, dtype=None, series=False, intermediate=False):
+        """Декоратор регистрации функции как признака name"""
+        def decorator(func):
+            self.add(Feature(name, inputs, func, dtype, series, intermediate))
+            return func
+        return decorator
+
+    @property
+    def columns(self):
+        """Имена признаков, добавляемых в DataFrame (без промежуточных)"""
+        return [name for name, feature in self.features.items() if not feature.intermediate]
+
+    def copy(self):
+        return FeatureRegistry(self.features.values())
+
+    def resolve(self, names, available=()):
+        """Признаки для вычисления names в порядке зависимостей.
+
+        available - уже имеющиеся столбцы (не вычисляются повторно).
+        """
+        available = set(available)
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in available:
+                return
+            if name not in self.features:
+                raise KeyError(f"Столбец '{name}' отсутствует в данных и не зарегистрирован как признак")
+            if name in visiting:
+                raise ValueError(f"Циклическая зависимость признака '{name}'")
+            visiting.add(name)
+            for dependency in self.features[name].inputs:
+                visit(dependency)
+            visiting.discard(name)
+            available.add(name)
+            order.append(self.features[name])
+
+        for name in names:
+            visit(name)
+        return order
+
+    def compute(self, df, names=DEFAULT_FEATURES):
+        """Добавление признаков names и их зависимостей в df (на месте), возвращает df"""
+        intermediates = {}
+
+        def value(col, series):
+            if col in intermediates:
+                return intermediates[col]
+            return df[col] if series else df[col].to_numpy()
+
+        for feature in self.resolve(names, df.columns):
+            values = feature(*(value(col, feature.series) for col in feature.inputs))
+            if feature.intermediate:
+                intermediates[feature.name] = values
+            else:
+                df[feature.name] = values
+        return df
+
+
+FEATURES = FeatureRegistry()
+
+
+@FEATURES.register('IsChild', ['Age_processed'], dtype='bool')
+def is_child(age, out):
+    return np.less(age, CHILD_AGE, out=out)
+
+
+@FEATURES.register('TotalRelatives', ['Siblings/Spouses Aboard', 'Parents/Children Aboard'])
+def total_relatives(siblings, parents):
+    return np.add(siblings, parents)
+
+
+@FEATURES.register('AgeGroup', ['Age_processed'])
+def age_group(age):
+    return pd.cut(age, bins=AGE_BINS, labels=AGE_LABELS, right=False)
+
+
+@FEATURES.register('FamilySize', ['TotalRelatives'])
+def family_size(relatives):
+    return np.add(relatives, 1)
+
+
+@FEATURES.register('FarePerPerson', ['Fare', 'TotalRelatives'], dtype='float64')
+def fare_per_person(fare, relatives, out):
+    """Стоимость билета на человека: Fare / (TotalRelatives + 1) в одном выходном массиве"""
+    np.add(relatives, 1, out=out)
+    return np.divide(fare, out, out=out)
+
+
+@FEATURES.register('NameParts', ['Name'], series=True, intermediate=True)
+def name_parts(name):
+    """Все части имени за один разбор (names.parse_names) для Title, Surname и MaidenName"""
+    return parse_names(name)
+
+
+@FEATURES.register('Title', ['NameParts'], series=True)
+def title(parts):
+    """Обращение из имени ('Mr. Owen Harris Braund' -> 'Mr')"""
+    return parts['Title']
+
+
+@FEATURES.register('Surname', ['NameParts'], series=True)
+def surname(parts):
+    return parts['Surname']
+
+
+@FEATURES.register('MaidenName', ['NameParts'], series=True)
+def maiden_name(parts):
+    return parts['MaidenName']
+
+
+@FEATURES.register('FamilyID', ['Surname', 'Pclass', 'Fare'], series=True)
+def family_id(surname, pclass, fare):
+    """Номер семьи: одинаковые фамилия, класс и стоимость билета (хеш-соединение, см. names.family_ids)"""
+    return family_ids(surname, pclass, fare)
@@ -0,0 +1,314 @@
+"""Графики lab1.py: построение фигур и пакетный вывод в файлы.
+
+Функции plot_* строят фигуру и возвращают её, не показывая. В
+интерактивном режиме фигура выводится через show_figure(), в пакетном
+(без дисплея) - render_figures() сохраняет фигуры в PNG/SVG, строя
+независимые фигуры параллельно в пуле процессов и пропуская фигуры,
+входные данные которых не изменились с прошлого запуска.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import instrumentation
+from features import FEATURES
+
+# Файл со слепками входных данных уже построенных фигур
+MANIFEST_NAME = '.figures.json'
+
+_plotting = None
+
+
+def _pyplot(headless=False):
+    """Отложенная загрузка matplotlib/seaborn и настройка стиля графиков"""
+    global _plotting
+    if _plotting is None:
+        import matplotlib
+        if headless:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # Установка русского шрифта для графиков
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+        plt.rcParams['axes.unicode_minus'] = False
+
+        # Настройка стиля графиков
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        _plotting = (plt, sns)
+    return _plotting
+
+
+def plot_zero_values(df, numeric_zero_df, numeric_columns):
+    """Визуализация нулевых значений"""
+    plt, sns = _pyplot()
+    fig = plt.figure(figsize=(12, 8))
+
+    # График 1: Количество нулевых значений по полям
+    plt.subplot(2, 2, 1)
+    zero_data = numeric_zero_df[numeric_zero_df['Нулевых значений'] > 0]
+    if len(zero_data) > 0:
+        sns.barplot(data=zero_data, x='Поле', y='Нулевых значений')
+        plt.title('Количество нулевых значений по числовым полям', fontweight='bold')
+        plt.xticks(rotation=45)
+        plt.ylabel('Количество нулевых значений')
+
+    # График 2: Процент нулевых значений
+    plt.subplot(2, 2, 2)
+    if len(zero_data) > 0:
+        sns.barplot(data=zero_data, x='Поле', y='Процент')
+        plt.title('Процент нулевых значений по числовым полям', fontweight='bold')
+        plt.xticks(rotation=45)
+        plt.ylabel('Процент нулевых значений (%)')
+
+    # График 3: Распределение полей с нулевыми значениями
+    plt.subplot(2, 2, 3)
+    fields_with_zeros = len(zero_data)
+    fields_without_zeros = len(numeric_columns) - fields_with_zeros
+    plt.pie([fields_with_zeros, fields_without_zeros],
+            labels=[f'С нулевыми значениями\n({fields_with_zeros})',
+                   f'Без нулевых значений\n({fields_without_zeros})'],
+            autopct='%1.1f%%', startangle=90)
+    plt.title('Распределение числовых полей по наличию нулевых значений', fontweight='bold')
+
+    # График 4: Анализ стоимости билета
+    plt.subplot(2, 2, 4)
+    fare_zero_data = df[df['Fare'] == 0]
+    if len(fare_zero_data) > 0:
+        fare_zero_by_class = fare_zero_data['Pclass'].value_counts().sort_index()
+        plt.bar(fare_zero_by_class.index, fare_zero_by_class.values)
+        plt.title('Распределение бесплатных билетов по классам', fontweight='bold')
+        plt.xlabel('Класс')
+        plt.ylabel('Количество бесплатных билетов')
+        plt.xticks([1, 2, 3])
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_survival_overview(df_processed):
+    """Панель 2x2: выживаемость по классу/полу, возраст, стоимость, родственники"""
+    plt, sns = _pyplot()
+
+    # Создаем фигуру с несколькими subplots
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('АНАЛИЗ ДАННЫХ ТИТАНИКА', fontsize=16, fontweight='bold')
+
+    # График 1: Выживаемость по классу и полу
+    sns.barplot(x='Pclass', y='Survived', hue='Sex', data=df_processed, ax=axes[0, 0])
+    axes[0, 0].set_title('Выживаемость по классу и полу', fontsize=14, fontweight='bold')
+    axes[0, 0].set_ylabel('Доля выживших', fontsize=12)
+    axes[0, 0].set_xlabel('Класс билета', fontsize=12)
+    axes[0, 0].set_xticks([0, 1, 2])
+    axes[0, 0].set_xticklabels(['Первый', 'Второй', 'Третий'])
+    axes[0, 0].legend(title='Пол', labels=['Мужской', 'Женский'])
+
+    # График 2: Распределение возрастов
+    sns.histplot(data=df_processed, x='Age', hue='Survived', bins=20, kde=True, ax=axes[0, 1])
+    axes[0, 1].set_title('Распределение возраста по выживаемости', fontsize=14, fontweight='bold')
+    axes[0, 1].set_xlabel('Возраст', fontsize=12)
+    axes[0, 1].set_ylabel('Количество пассажиров', fontsize=12)
+    handles, labels = axes[0, 1].get_legend_handles_labels()
+    axes[0, 1].legend(handles, ['Не выжил', 'Выжил'], title='Результат')
+
+    # График 3: Стоимость билета vs Выживаемость
+    sns.boxplot(x='Survived', y='Fare', data=df_processed, ax=axes[1, 0])
+    axes[1, 0].set_title('Распределение стоимости билета', fontsize=14, fontweight='bold')
+    axes[1, 0].set_xlabel('Выживаемость', fontsize=12)
+    axes[1, 0].set_xticks([0, 1])
+    axes[1, 0].set_xticklabels(['Не выжил', 'Выжил'])
+    axes[1, 0].set_ylabel('Стоимость билета (£)', fontsize=12)
+
+    # График 4: Количество родственников
+    # Признак TotalRelatives берётся из данных, если уже вычислен (раздел 6)
+    if 'TotalRelatives' in df_processed.columns:
+        relatives_sum = df_processed['TotalRelatives']
+    else:
+        relatives_sum = FEATURES['TotalRelatives'](df_processed['Siblings/Spouses Aboard'],
+                                                   df_processed['Parents/Children Aboard'])
+    sns.countplot(x=relatives_sum, hue=df_processed['Survived'], ax=axes[1, 1])
+    axes[1, 1].set_title('Выживаемость по количеству родственников', fontsize=14, fontweight='bold')
+    axes[1, 1].set_xlabel('Всего родственников на борту', fontsize=12)
+    axes[1, 1].set_ylabel('Количество пассажиров', fontsize=12)
+    axes[1, 1].legend(title='Выжил', labels=['Нет', 'Да'])
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_correlation(correlation):
+    """Тепловая карта корреляций"""
+    plt, sns = _pyplot()
+    fig = plt.figure(figsize=(10, 8))
+
+    # УБИРАЕМ МАСКУ для полного отображения матрицы
+    sns.heatmap(correlation, annot=True, cmap='coolwarm', center=0,
+                square=True, fmt='.2f', cbar_kws={'shrink': 0.8},
+                linewidths=0.5, linecolor='white')
+    plt.title('МАТРИЦА КОРРЕЛЯЦИЙ МЕЖДУ ПРИЗНАКАМИ', fontsize=16, fontweight='bold', pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def plot_outliers(df, df_processed):
+    """Визуализация выбросов ДО и ПОСЛЕ обработки"""
+    plt, sns = _pyplot()
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+
+    # Возраст до обработки
+    sns.boxplot(y=df['Age'], ax=ax1)
+    ax1.set_title('Возраст ДО обработки', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Возраст', fontsize=12)
+
+    # Возраст после обработки
+    sns.boxplot(y=df_processed['Age_processed'], ax=ax2)
+    ax2.set_title('Возраст ПОСЛЕ обработки', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Возраст', fontsize=12)
+
+    # Стоимость до обработки
+    sns.boxplot(y=df['Fare'], ax=ax3)
+    ax3.set_title('Стоимость ДО обработки', fontsize=14, fontweight='bold')
+    ax3.set_ylabel('Стоимость билета (£)', fontsize=12)
+
+    # Стоимость после обработки
+    sns.boxplot(y=df_processed['Fare_processed'], ax=ax4)
+    ax4.set_title('Стоимость ПОСЛЕ обработки', fontsize=14, fontweight='bold')
+    ax4.set_ylabel('Стоимость билета (£)', fontsize=12)
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_age_groups(df_processed, age_group_table=None):
+    """Выживаемость по возрастным группам и распределение по классам.
+
+    age_group_table - готовая таблица mean/count по AgeGroup (SurvivalCube.table);
+    если не задана, вычисляется по df_processed.
+    """
+    plt, sns = _pyplot()
+    fig = plt.figure(figsize=(12, 6))
+
+    if age_group_table is None:
+        survival_by_agegroup = df_processed.groupby('AgeGroup', observed=True)['Survived'].mean().reset_index()
+    else:
+        survival_by_agegroup = age_group_table['mean'].rename('Survived').reset_index()
+
+    plt.subplot(1, 2, 1)
+    sns.barplot(x='AgeGroup', y='Survived', data=survival_by_agegroup,
+                hue='AgeGroup', legend=False, palette='viridis')
+    plt.title('Выживаемость по возрастным группам', fontsize=14, fontweight='bold')
+    plt.xlabel('Возрастная группа', fontsize=12)
+    plt.ylabel('Доля выживших', fontsize=12)
+    plt.xticks(rotation=45, ha='right')
+
+    plt.subplot(1, 2, 2)
+    class_distribution = df_processed['Pclass'].value_counts().sort_index()
+    colors = ['gold', 'lightcoral', 'lightskyblue']
+    labels = ['Первый класс', 'Второй класс', 'Третий класс']
+    plt.pie(class_distribution.values, labels=labels, autopct='%1.1f%%',
+            startangle=90, colors=colors)
+    plt.title('Распределение пассажиров по классам', fontsize=14, fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+
+# Фигуры по именам (имена используются для файлов и пула процессов)
+FIGURES = {
+    'zero_values': plot_zero_values,
+    'survival_overview': plot_survival_overview,
+    'correlation': plot_correlation,
+    'outliers': plot_outliers,
+    'age_groups': plot_age_groups,
+}
+
+
+def show_figure(fig):
+    """Интерактивный показ фигуры"""
+    plt, _ = _pyplot()
+    plt.show()
+
+
+def _fingerprint(name, args, formats):
+    """Слепок входных данных фигуры: SHA-256 по содержимому аргументов"""
+    digest = hashlib.sha256(name.encode())
+    digest.update(repr(sorted(formats)).encode())
+    for arg in args:
+        if isinstance(arg, pd.DataFrame):
+            digest.update(repr(list(arg.columns)).encode())
+            digest.update(repr(list(arg.dtypes)).encode())
+            digest.update(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        elif isinstance(arg, pd.Series):
+            digest.update(repr((arg.name, arg.dtype)).encode())
+            digest.update(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        else:
+            digest.update(repr(arg).encode())
+    return digest.hexdigest()
+
+
+def _render(name, args, output_dir, formats, trace=False):
+    """Построение одной фигуры и сохранение во всех форматах.
+
+    Возвращает (пути, событие замера или None). Событие не публикуется
+    здесь, так как функция может выполняться в процессе пула.
+    """
+    timer = instrumentation.Span(name, 'figure', publish=False, formats=list(formats))
+    with timer if trace else instrumentation.NULL_SPAN:
+        plt, _ = _pyplot(headless=True)
+        fig = FIGURES[name](*args)
+        paths = []
+        for fmt in formats:
+            path = os.path.join(output_dir, f'{name}.{fmt}')
+            fig.savefig(path, format=fmt, bbox_inches='tight')
+            paths.append(path)
+        plt.close(fig)
+    return paths, timer.event
+
+
+def render_figures(jobs, output_dir, formats=('png',), workers=None):
+    """Пакетное сохранение фигур в output_dir.
+
+    jobs    - список (имя фигуры из FIGURES, аргументы построителя)
+    workers - число процессов (None - по числу ядер, 1 - без пула)
+    Возвращает (сохранённые пути, имена пропущенных фигур).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    # Фигуры с неизменными входными данными и существующими файлами пропускаются
+    pending, skipped, fingerprints = [], [], {}
+    for name, args in jobs:
+        fingerprints[name] = _fingerprint(name, args, formats)
+        files_exist = all(os.path.exists(os.path.join(output_dir, f'{name}.{fmt}')) for fmt in formats)
+        if manifest.get(name) == fingerprints[name] and files_exist:
+            skipped.append(name)
+        else:
+            pending.append((name, args))
+
+    saved, results = [], []
+    trace = instrumentation.enabled()
+    if workers == 1 or len(pending) <= 1:
+        results = [_render(name, args, output_dir, formats, trace) for name, args in pending]
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render, name, args, output_dir, formats, trace) for name, args in pending]
+            results = [future.result() for future in futures]
+    for paths, event in results:
+        saved.extend(paths)
+        if event is not None:
+            instrumentation.emit(event)
+
+    for name, _ in pending:
+        manifest[name] = fingerprints[name]
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return saved, skipped
@@ -0,0 +1,187 @@
+"""Заполнение пропусков статистиками групп (раздел 2.1 lab1.py).
+
+Статистики групп вычисляются встроенными агрегациями groupby (без
+Python-лямбды на каждую группу) и подставляются в пропуски одним
+векторизованным поиском по индексу групп. Обученные статистики можно
+сохранить в JSON и применять к новым партиям данных без пересчёта.
+Медианы групп можно оценивать скетчами KLL (error - допустимая ошибка
+ранга): один проход по частям данных (partial_fit) с постоянной памятью
+и объединением скетчей между процессами (merge).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from sketches import KLLSketch
+
+STRATEGIES = ('median', 'mean', 'mode', 'constant')
+
+
+def _group_index(df, by):
+    """Индекс групп для строк df (MultiIndex для нескольких ключей)"""
+    if len(by) == 1:
+        return pd.Index(df[by[0]])
+    return pd.MultiIndex.from_frame(df[by])
+
+
+class GroupImputer:
+    """Заполнение пропусков в столбце статистикой группы.
+
+    column   - столбец с пропусками
+    by       - список столбцов-ключей группировки (может быть пустым)
+    strategy - 'median', 'mean', 'mode' или 'constant'
+    error    - для 'median': допустимая ошибка ранга медиан по скетчам KLL
+               (None - точные медианы)
+    """
+
+    def __init__(self, column, by=(), strategy='median', fill_value=None, error=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия '{strategy}', допустимые: {', '.join(STRATEGIES)}")
+        if strategy == 'constant' and fill_value is None:
+            raise ValueError("Для стратегии 'constant' нужно указать fill_value")
+        if error is not None and strategy != 'median':
+            raise ValueError("Оценка по скетчам (error) возможна только для стратегии 'median'")
+        self.column = column
+        self.by = list(by)
+        self.strategy = strategy
+        self.fill_value = fill_value
+        self.error = error
+        self.stats_ = None
+        self.sketches_ = None
+
+    def _aggregate(self, df):
+        values = df[self.column]
+        if self.strategy == 'mode':
+            # Самое частое значение группы; при равенстве - наименьшее (как Series.mode()[0])
+            counts = df.groupby(self.by + [self.column], observed=True).size().rename('_count').reset_index()
+            counts = counts.sort_values(self.by + ['_count', self.column],
+                                        ascending=[True] * len(self.by) + [False, True])
+            if not self.by:
+                return counts[self.column].iloc[0] if len(counts) else np.nan
+            counts = counts.drop_duplicates(self.by)
+            return counts.set_index(self.by)[self.column]
+        if not self.by:
+            return values.agg(self.strategy)
+        return df.groupby(self.by, observed=True)[self.column].agg(self.strategy)
+
+    def _sketch_stats(self):
+        """Медианы групп по накопленным скетчам"""
+        if not self.by:
+            return self.sketches_[()].median() if () in self.sketches_ else np.nan
+        keys = sorted(self.sketches_)
+        if len(self.by) == 1:
+            index = pd.Index([key[0] for key in keys], name=self.by[0])
+        else:
+            index = pd.MultiIndex.from_tuples(keys, names=self.by)
+        return pd.Series([self.sketches_[key].median() for key in keys], index=index,
+                         name=self.column, dtype='float64')
+
+    def partial_fit(self, df):
+        """Добавление части данных в скетчи групп (только при заданном error)"""
+        if self.error is None:
+            raise RuntimeError("partial_fit() доступен только для оценки медиан по скетчам (error)")
+        if self.sketches_ is None:
+            self.sketches_ = {}
+        if self.by:
+            groups = df.groupby(self.by, observed=True)[self.column]
+        else:
+            groups = [((), df[self.column])]
+        for key, values in groups:
+            key = key if isinstance(key, tuple) else (key,)
+            self.sketches_.setdefault(key, KLLSketch(self.error)).update(values)
+        self.stats_ = self._sketch_stats()
+        return self
+
+    def merge(self, other):
+        """Объединение со скетчами импутера, обученного на другой части данных"""
+        if self.sketches_ is None:
+            self.sketches_ = {}
+        for key, sketch in other.sketches_.items():
+            if key in self.sketches_:
+                self.sketches_[key].merge(sketch)
+            else:
+                self.sketches_[key] = sketch
+        self.stats_ = self._sketch_stats()
+        return self
+
+    @property
+    def rank_error(self):
+        """Наибольшая ошибка ранга медиан групп (0 для точных медиан)"""
+        if not self.sketches_:
+            return 0.0
+        return max(sketch.rank_error for sketch in self.sketches_.values())
+
+    def fit(self, df):
+        """Вычисление статистик групп по обучающим данным"""
+        if self.error is not None:
+            self.sketches_ = None
+            return self.partial_fit(df)
+        if self.strategy == 'constant':
+            self.stats_ = self.fill_value
+        else:
+            self.stats_ = self._aggregate(df)
+        return self
+
+    def fill_values(self, df):
+        """Значения для заполнения каждой строки df (NaN, если группа неизвестна)"""
+        if self.stats_ is None:
+            raise RuntimeError(f"Импутер для '{self.column}' не обучен: вызовите fit()")
+        if not isinstance(self.stats_, pd.Series):
+            return pd.Series(self.stats_, index=df.index)
+        filled = self.stats_.reindex(_group_index(df, self.by))
+        return pd.Series(filled.to_numpy(), index=df.index)
+
+    def transform(self, df):
+        """Столбец column с заполненными пропусками (новая Series)"""
+        values = df[self.column]
+        mask = values.isna()
+        if not mask.any():
+            return values.copy()
+        result = values.copy()
+        result[mask] = self.fill_values(df.loc[mask]).to_numpy()
+        return result
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def to_dict(self):
+        """Обученные параметры в виде, пригодном для JSON"""
+        if isinstance(self.stats_, pd.Series):
+            stats = self.stats_.reset_index().values.tolist()
+        elif self.stats_ is None:
+            stats = None
+        else:
+            stats = np.asarray(self.stats_).item()
+        return {
+            'column': self.column,
+            'by': self.by,
+            'strategy': self.strategy,
+            'fill_value': self.fill_value,
+            'error': self.error,
+            'stats': stats,
+        }
+
+    @classmethod
+    def from_dict(cls, params):
+        imputer = cls(params['column'], params['by'], params['strategy'], params['fill_value'],
+                      params.get('error'))
+        stats = params['stats']
+        if isinstance(stats, list):
+            frame = pd.DataFrame(stats, columns=imputer.by + [imputer.column])
+            imputer.stats_ = frame.set_index(imputer.by)[imputer.column]
+        else:
+            imputer.stats_ = stats
+        return imputer
+
+
+def save_imputers(imputers, path):
+    """Сохранение обученных импутеров в JSON-файл"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([imputer.to_dict() for imputer in imputers], f, ensure_ascii=False, indent=2)
+
+
+def load_imputers(path):
+    """Загрузка импутеров, сохранённых save_imputers()"""
+    with open(path, encoding='utf-8') as f:
+        return [GroupImputer.from_dict(params) for params in json.load(f)]
@@ -0,0 +1,199 @@
+"""Дозапись новых пассажиров без пересчёта всего файла (режим append).
+
+Между запусками в pickle-файле хранится состояние: гистограммы групп для
+импутации медианами, гистограммы столбцов выбросов после заполнения
+пропусков, обученные границы IQR, счётчики выживаемости по Pclass, Sex,
+AgeGroup и TotalRelatives и статистики матрицы корреляций. Новая партия
+обрабатывается функциями lab1.py, дописывается в конец обработанного
+CSV-файла, а сводка обновляется за время, пропорциональное размеру
+партии. Первая партия (пустое состояние) даёт тот же файл, что и
+lab1.run_pipeline().
+
+Границы выбросов обучаются на первой партии. После каждой партии
+выводится сдвиг квартилей накопленных данных относительно обученных
+(в долях IQR); при заданном refit_threshold границы переобучаются по всем
+накопленным данным, когда сдвиг превышает порог. Уже записанные строки
+при этом не переписываются.
+
+Запуск:
+    python incremental.py titanic.csv --state state.pkl --output titanic_processed.csv
+    python incremental.py new_rows.csv --state state.pkl --output titanic_processed.csv --refit-threshold 0.1
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+import lab1
+from columnar import file_format
+from correlation import CorrelationStats, numeric_columns
+from outliers import CLIP_SPECS
+from streaming import GroupMedianImputer, GroupSurvival, ValueCounter, fit_clipper
+
+# Счётчики выживаемости: столбец -> название для вывода
+SURVIVAL_GROUPS = {
+    'Pclass': 'классам',
+    'Sex': 'полу',
+    'AgeGroup': 'возрастным группам',
+    'TotalRelatives': 'количеству родственников',
+}
+
+
+class IncrementalState:
+    """Накопленное состояние конвейера для обработки новых партий"""
+
+    def __init__(self):
+        for column, _, strategy in lab1.IMPUTATION:
+            if strategy != 'median':
+                raise ValueError(f"Режим дозаписи поддерживает только стратегию 'median', задана '{strategy}'")
+        self.columns = None
+        self.n_rows = 0
+        self.survived = 0
+        self.imputers = {column: GroupMedianImputer(column, list(by)) for column, by, _ in lab1.IMPUTATION}
+        self.counters = {}
+        self.clipper = None
+        self.clipped = {}
+        self.refits = 0
+        self.survival = {column: GroupSurvival() for column in SURVIVAL_GROUPS}
+        self.correlation = None
+        # Размер выходного файла после последней успешной дозаписи
+        self.output_size = 0
+
+    def drift(self):
+        """Сдвиг квартилей накопленных данных от обученных, в долях обученного IQR"""
+        result = {}
+        for source, output, func, clip in self.clipper.specs:
+            if clip is None:
+                continue
+            counter = self.counters[source] if func is None else self.counters[source].apply(func)
+            Q1, Q3, IQR = self.clipper.stats_[output][:3]
+            shift = max(abs(counter.quantile(0.25) - Q1), abs(counter.quantile(0.75) - Q3))
+            result[output] = shift / IQR if IQR > 0 else (0.0 if shift == 0 else np.inf)
+        return result
+
+    def update(self, batch, refit_threshold=None):
+        """Обработка новой партии и обновление состояния.
+
+        Возвращает (обработанная партия, были ли переобучены границы).
+        """
+        if self.columns is None:
+            self.columns = list(batch.columns)
+        elif list(batch.columns) != self.columns:
+            raise ValueError(f"Столбцы партии {list(batch.columns)} не совпадают с накопленными {self.columns}")
+
+        # Медианы групп по всем накопленным данным, включая партию
+        for imputer in self.imputers.values():
+            imputer.update(batch)
+        imputers = [self.imputers[column].to_imputer() for column, _, _ in lab1.IMPUTATION]
+        df_processed = lab1.impute_missing(batch, imputers=imputers)
+
+        if self.correlation is None:
+            self.correlation = CorrelationStats(numeric_columns(df_processed))
+        self.correlation.update(df_processed)
+
+        # Границы выбросов: обучение на первой партии или по сдвигу квартилей
+        refitted = False
+        for source in {source for source, _, _, clip in CLIP_SPECS if clip is not None}:
+            self.counters.setdefault(source, ValueCounter()).update(df_processed[source])
+        if self.clipper is None:
+            self.clipper = fit_clipper(self.counters)
+        elif refit_threshold is not None and max(self.drift().values()) > refit_threshold:
+            self.clipper = fit_clipper(self.counters)
+            self.refits += 1
+            refitted = True
+        df_processed, _ = lab1.clip_outliers(df_processed, self.clipper)
+        for output, count in self.clipper.clipped_.items():
+            self.clipped[output] = self.clipped.get(output, 0) + count
+
+        df_processed = lab1.engineer_features(df_processed)
+        for column, stats in self.survival.items():
+            stats.update(df_processed[column].astype(object), df_processed['Survived'])
+        self.n_rows += len(df_processed)
+        self.survived += int(df_processed['Survived'].sum())
+        return df_processed, refitted
+
+
+def save_state(state, path):
+    """Сохранение состояния в pickle-файл (атомарная замена)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_state(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def append_batch(input_path, state_path, output_path=lab1.OUTPUT_PATH, refit_threshold=None):
+    """Обработка файла новых строк и дозапись в output_path.
+
+    Если файла состояния нет, партия считается первой: выходной файл
+    создаётся заново. Состояние сохраняется только после успешной
+    дозаписи вместе с размером файла; строки, дописанные запуском, который
+    не успел сохранить состояние, отбрасываются (файл обрезается до
+    сохранённого размера). Возвращает (состояние, строк в партии,
+    переобучены ли границы).
+    """
+    if file_format(output_path) != 'csv':
+        raise ValueError(f"Дозапись поддерживается только для CSV, задан файл '{output_path}'")
+    state = load_state(state_path) if os.path.exists(state_path) else IncrementalState()
+    first = state.n_rows == 0
+    exists = os.path.exists(output_path) and not first
+    if exists and os.path.getsize(output_path) > state.output_size:
+        os.truncate(output_path, state.output_size)
+
+    batch = lab1.load_data(input_path)
+    df_processed, refitted = state.update(batch, refit_threshold)
+    df_processed.to_csv(output_path, mode='a' if exists else 'w', header=not exists, index=False)
+    state.output_size = os.path.getsize(output_path)
+    save_state(state, state_path)
+    return state, len(batch), refitted
+
+
+def print_summary(state):
+    """Сводка по всем накопленным данным"""
+    print(f"\n📊 СВОДКА ПО НАКОПЛЕННЫМ ДАННЫМ:")
+    print(f"Общая выживаемость: {state.survived / state.n_rows:.2%} ({state.survived}/{state.n_rows})")
+    for column, title in SURVIVAL_GROUPS.items():
+        table = state.survival[column].table()
+        if column == 'AgeGroup':
+            table = table.reindex([label for label in lab1.AGE_LABELS if label in table.index])
+        print(f"\nВыживаемость по {title}:")
+        print(pd.DataFrame({'Выживаемость': table['mean'].map(lambda x: f"{x:.2%}"),
+                            'Количество': table['count']}))
+
+    print("\nГраницы выбросов:")
+    drift = state.drift()
+    for output, (Q1, Q3, IQR, lower, upper) in state.clipper.stats_.items():
+        print(f"  {output}: Q1: {Q1:.2f}, Q3: {Q3:.2f}, IQR: {IQR:.2f}, границы: [{lower:.2f}, {upper:.2f}], "
+              f"обработано выбросов: {state.clipped.get(output, 0)}, сдвиг квартилей: {drift[output]:.1%} IQR")
+    if state.refits:
+        print(f"  Границы переобучались: {state.refits} раз")
+
+    print("\nМАТРИЦА КОРРЕЛЯЦИЙ:")
+    print(state.correlation.corr().rename(index=lab1.RUSSIAN_COLUMNS, columns=lab1.RUSSIAN_COLUMNS).round(2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Дозапись новых пассажиров в обработанный файл')
+    parser.add_argument('path', help='файл с новыми строками (.csv, .parquet, .feather)')
+    parser.add_argument('--state', required=True, help='файл состояния (создаётся при первом запуске)')
+    parser.add_argument('--output', default=lab1.OUTPUT_PATH, help='обработанный CSV-файл для дозаписи')
+    parser.add_argument('--refit-threshold', type=float,
+                        help='переобучать границы выбросов при сдвиге квартилей больше этой доли IQR')
+    args = parser.parse_args()
+
+    state, rows, refitted = append_batch(args.path, args.state, args.output, args.refit_threshold)
+    print(f"✓ Обработано новых строк: {rows}, всего строк: {state.n_rows}")
+    if refitted:
+        print(f"✓ Границы выбросов переобучены: сдвиг квартилей превысил {args.refit_threshold:.0%} IQR")
+    print_summary(state)
+    print(f"\n💾 Обработанные данные дописаны в файл: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""Замеры этапов lab1.py: время, память, число строк и файл трассировки.
+
+Каждый замеряемый участок (раздел отчёта, analyze_outliers, построение
+графика) оформляется как span: контекстный менеджер, который при выходе
+формирует событие с временем по часам и процессорным временем, приростом
+пикового RSS, приростом памяти по tracemalloc (если tracemalloc запущен)
+и числом строк. События передаются зарегистрированным обработчикам
+(add_hook): это могут быть функции пользователя или запись в файл
+JSON Lines / Chrome trace (open_trace). Пока обработчиков нет, span()
+возвращает общий пустой объект и замеры не выполняются.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Форматы файла трассировки по расширению
+TRACE_FORMATS = {
+    '.jsonl': 'jsonl',
+    '.json': 'chrome',
+}
+
+_hooks = []
+_stack = []
+
+
+def _peak_rss():
+    """Пиковый RSS процесса в байтах (None, если недоступен)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Span:
+    """Замер одного участка кода.
+
+    После выхода из блока событие доступно в event и передаётся
+    обработчикам (если publish=True). Дополнительные поля события
+    (например, rows) задаются в конструкторе или через set().
+    """
+
+    def __init__(self, name, category='stage', publish=True, **args):
+        self.name = name
+        self.category = category
+        self.publish = publish
+        self.args = args
+        self.event = None
+        self._child_peak = 0
+
+    def set(self, **args):
+        self.args.update(args)
+        return self
+
+    def __enter__(self):
+        self._tracing = tracemalloc.is_tracing()
+        if self._tracing:
+            self._memory, peak = tracemalloc.get_traced_memory()
+            # Пик внешнего замера до начала этого сохраняется перед сбросом
+            if _stack:
+                _stack[-1]._child_peak = max(_stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+        self._rss = _peak_rss()
+        _stack.append(self)
+        self._start = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _stack.pop()
+        event = {
+            'name': self.name,
+            'cat': self.category,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'start': self._start,
+            'wall': wall,
+            'cpu': cpu,
+        }
+        rss = _peak_rss()
+        if rss is not None:
+            event['rss_peak'] = rss
+            event['rss_peak_delta'] = rss - self._rss
+        if self._tracing and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Вложенные замеры сбрасывают пик, поэтому учитывается и их максимум
+            peak = max(peak, self._child_peak)
+            event['mem_delta'] = current - self._memory
+            event['mem_peak_delta'] = peak - self._memory
+            if _stack:
+                _stack[-1]._child_peak = max(_stack[-1]._child_peak, peak)
+        if exc_type is not None:
+            event['error'] = exc_type.__name__
+        event.update(self.args)
+        self.event = event
+        if self.publish:
+            emit(event)
+        return False
+
+
+class _NullSpan:
+    """Пустой замер, используемый при выключенных обработчиках"""
+
+    event = None
+
+    def set(self, **args):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def enabled():
+    """Включены ли замеры (есть ли хотя бы один обработчик)"""
+    return bool(_hooks)
+
+
+def span(name, category='stage', **args):
+    """Замер блока with; без обработчиков - пустой объект без накладных расходов"""
+    if not _hooks:
+        return NULL_SPAN
+    return Span(name, category, **args)
+
+
+def emit(event):
+    """Передача готового события всем обработчикам"""
+    for hook in list(_hooks):
+        hook(event)
+
+
+def add_hook(hook):
+    """Регистрация обработчика событий: функции hook(event)"""
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+class Sections:
+    """Последовательные разделы отчёта: начало раздела завершает предыдущий"""
+
+    def __init__(self, category='section'):
+        self.category = category
+        self.current = None
+
+    def start(self, name, **args):
+        self.finish()
+        self.current = span(name, self.category, **args).__enter__()
+        return self.current
+
+    def finish(self):
+        if self.current is not None:
+            current, self.current = self.current, None
+            current.__exit__(None, None, None)
+
+
+# =============================================================================
+# ФАЙЛЫ ТРАССИРОВКИ
+# =============================================================================
+
+class JsonLinesWriter:
+    """Запись каждого события отдельной JSON-строкой (сразу при получении)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def __call__(self, event):
+        self._file.write(json.dumps(event, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+class ChromeTraceWriter:
+    """Файл в формате Chrome trace event (chrome://tracing, Perfetto)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+
+    @property
+    def count(self):
+        return len(self.events)
+
+    def __call__(self, event):
+        args = {key: value for key, value in event.items()
+                if key not in ('name', 'cat', 'pid', 'tid', 'start', 'wall')}
+        self.events.append({
+            'name': event['name'],
+            'cat': event['cat'],
+            'ph': 'X',
+            'ts': event['start'] * 1e6,
+            'dur': event['wall'] * 1e6,
+            'pid': event['pid'],
+            'tid': event['tid'],
+            'args': args,
+        })
+
+    def close(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f,
+                      ensure_ascii=False, default=str)
+
+
+def open_trace(path, fmt=None):
+    """Включение записи событий в файл: .jsonl - JSON Lines, .json - Chrome trace"""
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in TRACE_FORMATS:
+            raise ValueError(f"Неизвестный формат трассировки '{path}', допустимые расширения: "
+                             f"{', '.join(TRACE_FORMATS)}")
+        fmt = TRACE_FORMATS[ext]
+    writer = JsonLinesWriter(path) if fmt == 'jsonl' else ChromeTraceWriter(path)
+    return add_hook(writer)
+
+
+def close_trace(writer):
+    """Отключение обработчика open_trace() и закрытие файла"""
+    remove_hook(writer)
+    writer.close()
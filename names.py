@@ -0,0 +1,161 @@
+"""Разбор столбца Name: обращение, имена, фамилия, девичья фамилия и семьи.
+
+Формат имени: 'Mrs. John Bradley (Florence Briggs Thayer) Cumings' -
+обращение с точкой, имена, в скобках имя и девичья фамилия (последнее
+слово в скобках, если там больше одного слова), фамилия - последнее
+слово. Фамилии из нескольких слов ('Vander Planke') сводятся к последнему
+слову одинаково у мужа и жены, поэтому не мешают поиску семей.
+
+Одинаковые имена разбираются один раз (pd.factorize): регулярное
+выражение применяется к массиву различных строк ядром Arrow
+(pyarrow.compute.extract_regex) или, без pyarrow, векторизованным
+str.extract. Части имён возвращаются как category: фамилии и девичьи
+фамилии кодируются общим словарём, поэтому их коды можно сравнивать.
+
+Семьи (FamilyID) - пассажиры с одинаковой фамилией, классом и стоимостью
+билета; номера семей присваиваются хеш-соединением ключей пассажиров с
+таблицей различных ключей, а не попарным сравнением пассажиров. Так же
+(по коду девичьей фамилии) находятся семьи, связанные через жену.
+
+Запуск:
+    python names.py titanic.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_table
+
+# Части имени: обращение, имена, девичья фамилия (последнее слово в скобках, если в
+# скобках больше одного слова) и фамилия - последнее слово имени (после скобок -
+# группа Surname, без скобок - LastWord)
+NAME_PATTERN = (r'^\s*(?:(?:the\s+)?(?P<Title>[^.\s]+)\.\s*)?(?P<GivenNames>[^(]*?)\s*'
+                r'(?:\((?:[^)]*\s(?P<MaidenName>[^)\s]{2,})|[^)]*)\s*\)\s*(?:[^()]*\s)?(?P<Surname>[^()\s]+)'
+                r'|(?P<LastWord>\S+))\s*$')
+NAME_PARTS = ['Title', 'GivenNames', 'MaidenName', 'Surname']
+
+# Ключи семьи: фамилия, класс и стоимость билета (общий билет семьи)
+FAMILY_KEYS = ['Surname', 'Pclass', 'Fare']
+
+
+def _extract(values):
+    """Части имён для массива различных строк: DataFrame со столбцами NAME_PARTS (None - нет части)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        parts = pd.Series(values, dtype=object).str.extract(NAME_PATTERN)
+        parts = parts.where(parts.notna() & (parts != ''), None)
+    else:
+        struct = pc.extract_regex(pa.array(values, type=pa.string()), NAME_PATTERN)
+        parts = {}
+        for part in NAME_PARTS + ['LastWord']:
+            field = pc.struct_field(struct, part)
+            # Неучаствовавшая группа даёт пустую строку
+            parts[part] = pc.if_else(pc.equal(field, ''), pa.scalar(None, pa.string()), field).to_numpy(
+                zero_copy_only=False)
+        parts = pd.DataFrame(parts)
+    parts['Surname'] = parts['Surname'].where(parts['Surname'].notna(), parts['LastWord'])
+    return parts[NAME_PARTS]
+
+
+def _encode(values, dictionary, codes):
+    """Categorical по частям различных имён values и кодам имён codes (-1 - пропуск)"""
+    part_codes = np.append(dictionary.get_indexer(values), -1)[codes]
+    return pd.Categorical.from_codes(part_codes, dtype=pd.CategoricalDtype(dictionary), validate=False)
+
+
+def parse_names(names):
+    """Части имён (NAME_PARTS) для Series names, каждая как category"""
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        # Словарь уже есть: разбираются только категории
+        codes, uniques = names.cat.codes.to_numpy(), names.cat.categories
+    else:
+        codes, uniques = pd.factorize(names)
+    parts = _extract(np.asarray(uniques, dtype=object))
+
+    surnames = pd.Index(pd.concat([parts['Surname'], parts['MaidenName']]).dropna().unique()).sort_values()
+    result = {}
+    for part in NAME_PARTS:
+        if part in ('Surname', 'MaidenName'):
+            dictionary = surnames
+        else:
+            dictionary = pd.Index(parts[part].dropna().unique()).sort_values()
+        result[part] = _encode(parts[part], dictionary, codes)
+    return pd.DataFrame(result, index=names.index)
+
+
+def _family_keys(surname, pclass, fare):
+    return pd.DataFrame({'Surname': pd.Series(surname).cat.codes.to_numpy(),
+                         'Pclass': np.asarray(pclass), 'Fare': np.asarray(fare)})
+
+
+def family_ids(surname, pclass, fare):
+    """Номер семьи каждого пассажира (-1, если фамилия не разобрана).
+
+    surname - category из parse_names(). Различные ключи FAMILY_KEYS
+    нумеруются в порядке первого появления, пассажиры получают номер
+    хеш-соединением с этой таблицей.
+    """
+    keys = _family_keys(surname, pclass, fare)
+    families = keys.drop_duplicates(ignore_index=True)
+    families = families.assign(FamilyID=np.arange(len(families)))
+    ids = keys.merge(families, on=FAMILY_KEYS, how='left', sort=False)['FamilyID'].to_numpy()
+    return np.where(keys['Surname'].to_numpy() >= 0, ids, -1)
+
+
+def maiden_links(parts, pclass, family_id):
+    """Семьи, связанные через девичью фамилию жены.
+
+    Хеш-соединение (код девичьей фамилии, класс) замужних пассажирок с
+    (код фамилии, класс) семей. Возвращает DataFrame пар FamilyID,
+    RelatedFamilyID с фамилиями.
+    """
+    frame = pd.DataFrame({'FamilyID': family_id, 'Pclass': np.asarray(pclass),
+                          'Surname': parts['Surname'].cat.codes.to_numpy(),
+                          'MaidenName': parts['MaidenName'].cat.codes.to_numpy()})
+    wives = frame.loc[frame['MaidenName'] >= 0, ['FamilyID', 'MaidenName', 'Pclass']]
+    families = frame.loc[frame['FamilyID'] >= 0, ['FamilyID', 'Surname', 'Pclass']].drop_duplicates()
+    links = wives.merge(families.rename(columns={'FamilyID': 'RelatedFamilyID', 'Surname': 'MaidenName'}),
+                        on=['MaidenName', 'Pclass'])
+    links = links[links['FamilyID'] != links['RelatedFamilyID']].drop_duplicates(['FamilyID', 'RelatedFamilyID'])
+    dictionary = parts['Surname'].cat.categories
+    return pd.DataFrame({
+        'FamilyID': links['FamilyID'].to_numpy(),
+        'RelatedFamilyID': links['RelatedFamilyID'].to_numpy(),
+        'MaidenName': dictionary[links['MaidenName'].to_numpy()],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Разбор имён пассажиров и поиск семей')
+    parser.add_argument('path', nargs='?', default='titanic.csv', help='входной файл (.csv, .parquet, .feather, .cols)')
+    args = parser.parse_args()
+
+    df = read_table(args.path, ['Name', 'Pclass', 'Fare'])
+    start = time.perf_counter()
+    parts = parse_names(df['Name'])
+    ids = family_ids(parts['Surname'], df['Pclass'], df['Fare'])
+    links = maiden_links(parts, df['Pclass'], ids)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ Разобрано имён: {len(df)} ({df['Name'].nunique()} различных) за {elapsed * 1000:.1f} мс")
+    print(f"  Не разобрано: {int(parts['Surname'].isna().sum() - df['Name'].isna().sum())}")
+    print(f"\nОбращения:")
+    print(parts['Title'].value_counts().head(10).to_string())
+    print(f"\nРазличных фамилий: {parts['Surname'].nunique()}, "
+          f"девичьих фамилий: {int(parts['MaidenName'].notna().sum())}")
+
+    sizes = pd.Series(ids[ids >= 0]).value_counts()
+    print(f"\nСемей: {len(sizes)}, из них из нескольких пассажиров: {int((sizes > 1).sum())}")
+    largest = sizes.head(5)
+    for family_id, size in largest.items():
+        row = int(np.flatnonzero(ids == family_id)[0])
+        print(f"  {parts['Surname'].iloc[row]} (класс {df['Pclass'].iloc[row]}): {size} чел.")
+    print(f"\nСемей, связанных через девичью фамилию: {len(links)}")
+
+
+if __name__ == '__main__':
+    main()
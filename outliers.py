@@ -0,0 +1,165 @@
+"""Обрезание выбросов по IQR с сохраняемыми границами (раздел 5.1 lab1.py).
+
+Границы Q1 - k*IQR и Q3 + k*IQR вычисляются один раз на эталонных
+данных (fit), сохраняются в JSON и применяются к новым партиям или
+отдельным пассажирам (transform) за постоянное время на строку.
+Количество обрезанных значений считается во время transform, без
+повторного вычисления квантилей. При заданном error квартили оцениваются
+скетчами KLL за один проход с ограниченной ошибкой ранга.
+"""
+import json
+
+import numpy as np
+
+from sketches import KLLSketch
+
+# Множитель межквартильного размаха для границ выбросов
+IQR_MULTIPLIER = 1.5
+
+# Обработка выбросов: (исходный столбец, новый столбец, функция numpy,
+# обрезание: 'both' - с двух сторон, 'upper' - сверху, None - без обрезания)
+CLIP_SPECS = [
+    ('Age', 'Age_processed', None, 'both'),
+    ('Fare', 'Fare_log', 'log1p', None),
+    ('Fare', 'Fare_processed', None, 'upper'),
+]
+
+
+def outlier_bounds(data, column_name, multiplier=IQR_MULTIPLIER):
+    """Квартили, IQR и границы выбросов для столбца"""
+    Q1 = data[column_name].quantile(0.25)
+    Q3 = data[column_name].quantile(0.75)
+    IQR = Q3 - Q1
+    return Q1, Q3, IQR, Q1 - multiplier * IQR, Q3 + multiplier * IQR
+
+
+def sketch_bounds(sketch, multiplier=IQR_MULTIPLIER):
+    """Квартили, IQR и границы выбросов по скетчу KLL или гистограмме (объекту с методом quantile)"""
+    Q1 = sketch.quantile(0.25)
+    Q3 = sketch.quantile(0.75)
+    IQR = Q3 - Q1
+    return Q1, Q3, IQR, Q1 - multiplier * IQR, Q3 + multiplier * IQR
+
+
+class OutlierClipper:
+    """Обрезание выбросов по границам, обученным на эталонных данных.
+
+    error - допустимая ошибка ранга квартилей по скетчам KLL (None - точные
+    квартили); ошибка каждого столбца после обучения хранится в errors_.
+    """
+
+    def __init__(self, specs=CLIP_SPECS, multiplier=IQR_MULTIPLIER, error=None):
+        self.specs = [tuple(spec) for spec in specs]
+        self.multiplier = multiplier
+        self.error = error
+        self.stats_ = None
+        self.errors_ = {}
+        self.sketches_ = None
+        self.clipped_ = {}
+
+    def partial_fit(self, df):
+        """Добавление части данных в скетчи столбцов (только при заданном error)"""
+        if self.error is None:
+            raise RuntimeError("partial_fit() доступен только для оценки квартилей по скетчам (error)")
+        if self.sketches_ is None:
+            self.sketches_ = {}
+        for source, output, func, clip in self.specs:
+            if clip is None:
+                continue
+            values = df[source].to_numpy(dtype='float64')
+            if func is not None:
+                values = getattr(np, func)(values)
+            self.sketches_.setdefault(output, KLLSketch(self.error)).update(values)
+        return self._sketch_stats()
+
+    def merge(self, other):
+        """Объединение со скетчами, накопленными на другой части данных"""
+        if self.sketches_ is None:
+            self.sketches_ = {}
+        for output, sketch in other.sketches_.items():
+            if output in self.sketches_:
+                self.sketches_[output].merge(sketch)
+            else:
+                self.sketches_[output] = sketch
+        return self._sketch_stats()
+
+    def _sketch_stats(self):
+        self.stats_ = {output: tuple(float(x) for x in sketch_bounds(sketch, self.multiplier))
+                       for output, sketch in self.sketches_.items()}
+        self.errors_ = {output: sketch.rank_error for output, sketch in self.sketches_.items()}
+        return self
+
+    def fit(self, df):
+        """Вычисление Q1, Q3, IQR и границ для каждого обрезаемого столбца"""
+        if self.error is not None:
+            self.sketches_ = None
+            return self.partial_fit(df)
+        self.stats_ = {}
+        for source, output, func, clip in self.specs:
+            if clip is None:
+                continue
+            data = df[[source]]
+            if func is not None:
+                data = getattr(np, func)(data)
+            self.stats_[output] = tuple(float(x) for x in outlier_bounds(data, source, self.multiplier))
+        return self
+
+    def bounds(self, output):
+        """Границы (нижняя, верхняя) для нового столбца output"""
+        return self.stats_[output][3:]
+
+    def transform(self, df):
+        """Добавление обработанных столбцов в df (на месте), возвращает df.
+
+        Количество обрезанных значений каждого столбца сохраняется в clipped_.
+        """
+        if self.stats_ is None:
+            raise RuntimeError("OutlierClipper не обучен: вызовите fit()")
+        self.clipped_ = {}
+        for source, output, func, clip in self.specs:
+            values = df[source].to_numpy(dtype='float64', copy=True)
+            if func is not None:
+                getattr(np, func)(values, out=values)
+            if clip is not None:
+                lower, upper = self.bounds(output)
+                if clip == 'upper':
+                    lower = None
+                    clipped = np.count_nonzero(values > upper)
+                else:
+                    clipped = np.count_nonzero(values > upper) + np.count_nonzero(values < lower)
+                np.clip(values, lower, upper, out=values)
+                self.clipped_[output] = int(clipped)
+            df[output] = values
+        return df
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def to_dict(self):
+        return {
+            'specs': [list(spec) for spec in self.specs],
+            'multiplier': self.multiplier,
+            'error': self.error,
+            'stats': self.stats_,
+            'errors': self.errors_,
+        }
+
+    @classmethod
+    def from_dict(cls, params):
+        clipper = cls(params['specs'], params['multiplier'], params.get('error'))
+        if params['stats'] is not None:
+            clipper.stats_ = {output: tuple(stats) for output, stats in params['stats'].items()}
+            clipper.errors_ = params.get('errors', {})
+        return clipper
+
+
+def save_clipper(clipper, path):
+    """Сохранение обученных границ в JSON-файл"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(clipper.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def load_clipper(path):
+    """Загрузка границ, сохранённых save_clipper()"""
+    with open(path, encoding='utf-8') as f:
+        return OutlierClipper.from_dict(json.load(f))
@@ -0,0 +1,289 @@
+"""Параллельный запуск конвейера lab1.py в пуле процессов.
+
+Входные данные делятся на части: один файл на задачу (много файлов
+рейсов/сегментов), диапазоны байтов одного большого CSV-файла,
+выровненные по границам строк, или диапазоны строк хранилища colstore
+(процессы отображают в память одни и те же файлы столбцов). Работа идёт в два прохода пула.
+
+Первый проход собирает объединяемые гистограммы (streaming.ValueCounter):
+значения по группам импутации и значения столбцов с обрезанием выбросов.
+После объединения вычисляются глобальные медианы групп и квартили для
+границ IQR - те же, что дал бы последовательный запуск на всех данных.
+
+Второй проход обрабатывает части с глобальными параметрами, записывает
+их в файлы-части выходного файла и возвращает объединяемые итоги:
+выживаемость по классу, полу и возрастной группе, статистики матрицы
+корреляций и число обрезанных выбросов. Выходной файл совпадает с
+результатом lab1.run_pipeline() на объединённых данных.
+
+Запуск:
+    python parallel.py voyage_*.csv --output processed.csv --workers 8
+    python parallel.py big.csv --shards 16 --output processed.csv
+    python parallel.py big.cols --shards 16 --output processed.csv
+"""
+import argparse
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import lab1
+from colstore import ColumnStore, read_store
+from columnar import file_format, read_table, write_table
+from correlation import CorrelationStats, numeric_columns
+from outliers import OutlierClipper
+from streaming import GroupMedianImputer, GroupSurvival, ValueCounter, _as_tuple, fit_clipper
+
+# Группировки для итоговой выживаемости
+SURVIVAL_GROUPS = {
+    'by_class': 'Pclass',
+    'by_sex': 'Sex',
+    'by_age_group': 'AgeGroup',
+}
+
+
+# =============================================================================
+# РАЗБИЕНИЕ НА ЧАСТИ
+# =============================================================================
+
+def split_csv(path, shards):
+    """Деление CSV-файла на shards диапазонов байтов по границам строк.
+
+    Возвращает список частей (путь, начало, конец); первая часть
+    начинается с заголовка.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for i in range(1, shards):
+            f.seek(max(data_start + (size - data_start) * i // shards - 1, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    bounds[0] = 0
+    return [(path, start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def split_store(path, shards):
+    """Деление хранилища colstore на shards диапазонов строк (путь, начало, конец)"""
+    rows = ColumnStore(path).rows
+    bounds = [rows * i // shards for i in range(shards + 1)]
+    return [(path, start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def make_partitions(paths, shards=1):
+    """Части для обработки: каждый файл целиком или shards частей CSV-файла/хранилища"""
+    partitions = []
+    for path in paths:
+        if shards > 1 and file_format(path) == 'csv':
+            partitions.extend(split_csv(path, shards))
+        elif shards > 1 and file_format(path) == 'colstore':
+            partitions.extend(split_store(path, shards))
+        else:
+            partitions.append((path, 0, None))
+    return partitions
+
+
+def read_partition(partition):
+    """Загрузка одной части в DataFrame"""
+    path, start, end = partition
+    if end is None:
+        return lab1.load_data(path)
+    if file_format(path) == 'colstore':
+        return read_store(path, start=start, stop=end)
+    with open(path, 'rb') as f:
+        header = f.readline() if start > 0 else b''
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data))
+
+
+# =============================================================================
+# ПЕРВЫЙ ПРОХОД: ГИСТОГРАММЫ ДЛЯ МЕДИАН И КВАРТИЛЕЙ
+# =============================================================================
+
+def _clip_sources(clipper):
+    return sorted({source for source, _, _, clip in clipper.specs if clip is not None})
+
+
+def _fit_partition(partition, imputation, clip_sources):
+    """Гистограммы части: по группам импутации и по столбцам выбросов"""
+    df = read_partition(partition)
+    imputers = {}
+    for column, by, strategy in imputation:
+        if strategy != 'median':
+            raise ValueError(f"Параллельный режим поддерживает только стратегию 'median', задана '{strategy}'")
+        imputers[column] = GroupMedianImputer(column, list(by))
+        imputers[column].update(df)
+    counters = {}
+    for column in clip_sources:
+        if column not in imputers:
+            counters[column] = ValueCounter()
+            counters[column].update(df[column])
+    return imputers, counters
+
+
+def _merge_fit_states(states):
+    imputers, counters = states[0]
+    for other_imputers, other_counters in states[1:]:
+        for column, imputer in imputers.items():
+            imputer.merge(other_imputers[column])
+        for column, counter in counters.items():
+            counter.merge(other_counters[column])
+    return imputers, counters
+
+
+# =============================================================================
+# ВТОРОЙ ПРОХОД: ОБРАБОТКА ЧАСТЕЙ И ОБЪЕДИНЯЕМЫЕ ИТОГИ
+# =============================================================================
+
+def _transform_partition(partition, imputers, clipper, shard_path, header):
+    """Обработка части с глобальными параметрами и запись её в shard_path"""
+    df = read_partition(partition)
+    df_processed = lab1.impute_missing(df, imputers=imputers)
+
+    correlation = CorrelationStats(numeric_columns(df_processed)).update(df_processed)
+
+    df_processed, clipper = lab1.clip_outliers(df_processed, clipper)
+    df_processed = lab1.engineer_features(df_processed)
+
+    if file_format(shard_path) == 'csv':
+        df_processed.to_csv(shard_path, index=False, header=header)
+    else:
+        write_table(df_processed, shard_path)
+
+    survival = {}
+    for name, column in SURVIVAL_GROUPS.items():
+        survival[name] = GroupSurvival()
+        survival[name].update(df_processed[column].astype(object), df_processed['Survived'])
+    return {
+        'rows': len(df_processed),
+        'survived': int(df_processed['Survived'].sum()),
+        'survival': survival,
+        'correlation': correlation,
+        'clipped': dict(clipper.clipped_),
+    }
+
+
+def _merge_results(results):
+    total = results[0]
+    for other in results[1:]:
+        total['rows'] += other['rows']
+        total['survived'] += other['survived']
+        for name, stats in total['survival'].items():
+            stats.merge(other['survival'][name])
+        total['correlation'].merge(other['correlation'])
+        for output, count in other['clipped'].items():
+            total['clipped'][output] = total['clipped'].get(output, 0) + count
+    return total
+
+
+def _combine_shards(shard_paths, output_path):
+    """Сборка выходного файла из частей в исходном порядке"""
+    if file_format(output_path) == 'csv':
+        with open(output_path, 'wb') as out:
+            for shard_path in shard_paths:
+                with open(shard_path, 'rb') as f:
+                    shutil.copyfileobj(f, out)
+    else:
+        write_table(pd.concat([read_table(path) for path in shard_paths], ignore_index=True), output_path)
+
+
+def _map(pool, func, *iterables):
+    if pool is None:
+        return list(map(func, *iterables))
+    return list(pool.map(func, *iterables))
+
+
+def run_parallel(paths, output_path=lab1.OUTPUT_PATH, workers=None, shards=1):
+    """Конвейер lab1.py на файлах paths в workers процессах.
+
+    shards > 1 - дополнительно делить каждый CSV-файл на части.
+    Возвращает словарь итогов: импутеры, границы выбросов, выживаемость,
+    матрица корреляций, число строк и обрезанных выбросов.
+    """
+    partitions = make_partitions(paths, shards)
+    clip_sources = _clip_sources(OutlierClipper())
+    n = len(partitions)
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and n > 1 else None
+    try:
+        states = _map(pool, _fit_partition, partitions, [lab1.IMPUTATION] * n, [clip_sources] * n)
+        imputer_states, counters = _merge_fit_states(states)
+        imputers = [imputer_states[column].to_imputer() for column, _, _ in lab1.IMPUTATION]
+        for column, state in imputer_states.items():
+            counters[column] = state.filled_counter()
+        clipper = fit_clipper(counters)
+
+        ext = os.path.splitext(output_path)[1]
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp:
+            shard_paths = [os.path.join(tmp, f'part-{i:05d}{ext}') for i in range(n)]
+            results = _map(pool, _transform_partition, partitions, [imputers] * n, [clipper] * n,
+                           shard_paths, [i == 0 for i in range(n)])
+            _combine_shards(shard_paths, output_path)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    total = _merge_results(results)
+    survival = {name: stats.table() for name, stats in total['survival'].items()}
+    survival['by_age_group'] = survival['by_age_group'].reindex(
+        [label for label in lab1.AGE_LABELS if label in survival['by_age_group'].index])
+    return {
+        'partitions': n,
+        'rows': total['rows'],
+        'survived': total['survived'],
+        'survival_rate': total['survived'] / total['rows'] if total['rows'] else np.nan,
+        'imputers': imputers,
+        'clipper': clipper,
+        'clipped': total['clipped'],
+        'survival': survival,
+        'correlation': total['correlation'].corr(),
+    }
+
+
+def print_results(result):
+    print(f"Частей обработано: {result['partitions']}, строк: {result['rows']}")
+    print(f"\nОбщая выживаемость: {result['survival_rate']:.2%} ({result['survived']}/{result['rows']})")
+    titles = {'by_class': 'классам', 'by_sex': 'полу', 'by_age_group': 'возрастным группам'}
+    for name, title in titles.items():
+        table = result['survival'][name]
+        print(f"\nВыживаемость по {title}:")
+        print(pd.DataFrame({'Выживаемость': table['mean'].map(lambda x: f"{x:.2%}"),
+                            'Количество': table['count']}))
+
+    print("\nМедианы групп для заполнения пропусков:")
+    for imputer in result['imputers']:
+        for key, value in imputer.stats_.items():
+            print(f"  {imputer.column} {dict(zip(imputer.by, _as_tuple(key)))}: {value:.2f}")
+
+    print("\nГраницы выбросов:")
+    for output, (Q1, Q3, IQR, lower, upper) in result['clipper'].stats_.items():
+        print(f"  {output}: Q1: {Q1:.2f}, Q3: {Q3:.2f}, IQR: {IQR:.2f}, границы: [{lower:.2f}, {upper:.2f}], "
+              f"обработано выбросов: {result['clipped'].get(output, 0)}")
+
+    print("\nМАТРИЦА КОРРЕЛЯЦИЙ:")
+    print(result['correlation'].rename(index=lab1.RUSSIAN_COLUMNS, columns=lab1.RUSSIAN_COLUMNS).round(2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Параллельная предобработка данных Титаника')
+    parser.add_argument('paths', nargs='+', help='входные файлы (.csv, .parquet, .feather, .cols)')
+    parser.add_argument('--output', default=lab1.OUTPUT_PATH, help='файл для обработанных данных')
+    parser.add_argument('--workers', type=int, help='число процессов (по умолчанию по числу ядер)')
+    parser.add_argument('--shards', type=int, default=1, help='число частей каждого CSV-файла или хранилища')
+    args = parser.parse_args()
+
+    result = run_parallel(args.paths, args.output, args.workers, args.shards)
+    print_results(result)
+    print(f"\n💾 Обработанные данные сохранены в файл: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""Ленивое выполнение конвейера lab1.py по плану запроса.
+
+Конвейер описан как граф узлов NODES (загрузка -> импутация -> обрезание
+выбросов -> новые признаки -> агрегаты) на уровне отдельных столбцов:
+каждый узел знает, от каких узлов зависит. Для запрошенных результатов
+строится план - только нужные узлы в порядке зависимостей:
+
+- общие подвыражения вычисляются один раз (например, заполненный Age
+  используется в Age_processed, IsChild, AgeGroup, describe и корреляциях);
+- из файла читаются только столбцы, нужные плану (usecols/columns);
+- ненужные узлы не выполняются: для выживаемости по классам не строятся
+  Fare_log, границы выбросов и графики.
+
+Результат 'processed' совпадает с lab1.run_pipeline().
+
+Запуск:
+    python plan.py titanic.csv survival_by_class --explain
+"""
+import argparse
+
+import pandas as pd
+
+import lab1
+from features import DEFAULT_FEATURES, FEATURES
+from imputation import GroupImputer
+from instrumentation import span
+from outliers import CLIP_SPECS, OutlierClipper
+
+# Столбцы исходного файла в порядке следования
+RAW_COLUMNS = ['Survived', 'Pclass', 'Name', 'Sex', 'Age', 'Siblings/Spouses Aboard',
+               'Parents/Children Aboard', 'Fare']
+TEXT_COLUMNS = ['Name', 'Sex']
+NUMERIC_COLUMNS = [col for col in RAW_COLUMNS if col not in TEXT_COLUMNS]
+
+# Новые столбцы обработанных данных в порядке lab1.run_pipeline()
+DERIVED_COLUMNS = [output for _, output, _, _ in CLIP_SPECS] + DEFAULT_FEATURES
+
+
+def _frame(*series):
+    return pd.DataFrame({s.name: s for s in series})
+
+
+def _survival_table(keys, survived):
+    return survived.groupby(keys, observed=True).agg(['mean', 'count'])
+
+
+def _impute(column, by, strategy):
+    def impute(values, *keys):
+        frame = _frame(values, *keys)
+        return GroupImputer(column, by, strategy).fit_transform(frame)
+    return impute
+
+
+def _fill_text(values):
+    """Заполнение пропусков 'Unknown' (категория добавляется, только если есть пропуски, как в lab1.impute_missing)"""
+    if not values.isnull().any():
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype) and 'Unknown' not in values.cat.categories:
+        values = values.cat.add_categories('Unknown')
+    return values.fillna('Unknown')
+
+
+def _fit_clipper(spec):
+    return lambda values: OutlierClipper([spec]).fit(_frame(values))
+
+
+def _clip(output):
+    return lambda clipper, values: clipper.transform(_frame(values))[output]
+
+
+def _feature(feature):
+    if feature.intermediate:
+        return feature
+    return lambda *series: pd.Series(feature(*series), index=series[0].index, name=feature.name)
+
+
+def _fare_zero(fare, pclass, survived):
+    """Бесплатные билеты по классам (одна группировка вместо фильтров на каждый класс)"""
+    zero = fare == 0
+    return survived[zero].groupby(pclass[zero]).agg(['count', 'mean'])
+
+
+def _outlier_bounds(*clippers):
+    return {output: stats for clipper in clippers for output, stats in clipper.stats_.items()}
+
+
+def _build_nodes():
+    """Граф узлов: имя -> (зависимости, функция от значений зависимостей)"""
+    nodes = {}
+    for col in RAW_COLUMNS:
+        nodes[f'raw.{col}'] = (('load',), lambda df, col=col: df[col])
+
+    # 2.1. Импутация: числовые - статистиками групп, текстовые - 'Unknown'
+    imputed = {col: f'raw.{col}' for col in RAW_COLUMNS}
+    for column, by, strategy in lab1.IMPUTATION:
+        nodes[f'imputed.{column}'] = ((f'raw.{column}',) + tuple(f'raw.{key}' for key in by),
+                                      _impute(column, by, strategy))
+        imputed[column] = f'imputed.{column}'
+    for col in TEXT_COLUMNS:
+        nodes[f'imputed.{col}'] = ((f'raw.{col}',), _fill_text)
+        imputed[col] = f'imputed.{col}'
+
+    # 5.1. Выбросы: границы и обработанный столбец для каждого правила
+    for spec in CLIP_SPECS:
+        source, output = spec[0], spec[1]
+        nodes[f'clipper.{output}'] = ((imputed[source],), _fit_clipper(spec))
+        nodes[output] = ((f'clipper.{output}', imputed[source]), _clip(output))
+
+    # 6. Новые признаки из реестра features.FEATURES
+    for name, feature in FEATURES.features.items():
+        nodes[name] = (tuple(imputed.get(col, col) for col in feature.inputs), _feature(feature))
+
+    # Результаты
+    survived = imputed['Survived']
+    nodes['survival_by_class'] = ((imputed['Pclass'], survived), _survival_table)
+    nodes['survival_by_sex'] = ((imputed['Sex'], survived), _survival_table)
+    nodes['survival_by_age_group'] = (('AgeGroup', survived), _survival_table)
+    nodes['survival_by_relatives'] = (('TotalRelatives', survived), _survival_table)
+    nodes['child_survival'] = (('IsChild', survived), _survival_table)
+    nodes['fare_zero'] = (('raw.Fare', 'raw.Pclass', 'raw.Survived'), _fare_zero)
+    numeric = tuple(imputed[col] for col in NUMERIC_COLUMNS)
+    nodes['describe'] = (numeric, lambda *series: _frame(*series).describe())
+    nodes['correlation'] = (numeric, lambda *series: lab1.correlation_matrix(_frame(*series)))
+    nodes['outlier_bounds'] = (tuple(f'clipper.{output}' for _, output, _, clip in CLIP_SPECS if clip is not None),
+                               _outlier_bounds)
+    nodes['processed'] = (tuple(imputed[col] for col in RAW_COLUMNS) + tuple(DERIVED_COLUMNS), _frame)
+    return nodes
+
+
+NODES = _build_nodes()
+
+# Результаты, доступные для запроса
+OUTPUTS = ['survival_by_class', 'survival_by_sex', 'survival_by_age_group', 'survival_by_relatives',
+           'child_survival', 'fare_zero', 'describe', 'correlation', 'outlier_bounds', 'processed']
+OUTPUTS += [name for name in FEATURES.columns if name not in DERIVED_COLUMNS]
+
+
+class Plan:
+    """План запроса: узлы в порядке выполнения и столбцы для чтения"""
+
+    def __init__(self, outputs, nodes=NODES):
+        unknown = [name for name in outputs if name not in nodes or name == 'load']
+        if unknown:
+            raise KeyError(f"Неизвестные результаты: {', '.join(unknown)}; доступны: {', '.join(OUTPUTS)}")
+        self.outputs = list(outputs)
+        self.nodes = nodes
+        self.steps = []
+        visited = set()
+
+        def visit(name):
+            if name in visited:
+                return
+            visited.add(name)
+            for dependency in nodes[name][0] if name != 'load' else ():
+                visit(dependency)
+            self.steps.append(name)
+
+        for name in self.outputs:
+            visit(name)
+        # Проекция: из файла читаются только используемые исходные столбцы
+        self.columns = [col for col in RAW_COLUMNS if f'raw.{col}' in visited]
+
+    def explain(self):
+        """Текстовое описание плана"""
+        lines = [f"Чтение столбцов: {self.columns}"]
+        for i, name in enumerate(self.steps, 1):
+            dependencies = ', '.join(self.nodes[name][0]) if name != 'load' else ''
+            lines.append(f"  {i:2d}. {name}" + (f" <- {dependencies}" if dependencies else ''))
+        return '\n'.join(lines)
+
+    def execute(self, path=lab1.INPUT_PATH):
+        """Выполнение плана, возвращает {результат: значение}"""
+        values = {}
+        for name in self.steps:
+            with span(name, 'plan'):
+                if name == 'load':
+                    values[name] = lab1.load_data(path, self.columns)
+                else:
+                    dependencies, func = self.nodes[name]
+                    values[name] = func(*(values[dependency] for dependency in dependencies))
+        return {name: values[name] for name in self.outputs}
+
+
+class LazyPipeline:
+    """Ленивый конвейер по файлу: результаты вычисляются только при collect()"""
+
+    def __init__(self, path=lab1.INPUT_PATH):
+        self.path = path
+
+    def plan(self, *outputs):
+        return Plan(outputs)
+
+    def collect(self, *outputs):
+        return self.plan(*outputs).execute(self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ленивое вычисление результатов анализа Титаника')
+    parser.add_argument('path', nargs='?', default=lab1.INPUT_PATH, help='входной файл')
+    parser.add_argument('outputs', nargs='*', default=['survival_by_class'], help=f"результаты: {', '.join(OUTPUTS)}")
+    parser.add_argument('--explain', action='store_true', help='вывести план выполнения')
+    parser.add_argument('--output', help='файл для результата processed (.csv, .parquet, .feather)')
+    args = parser.parse_args()
+
+    outputs = list(args.outputs)
+    if args.output and 'processed' not in outputs:
+        outputs.append('processed')
+    pipeline = LazyPipeline(args.path)
+    if args.explain:
+        print(pipeline.plan(*outputs).explain())
+    results = pipeline.collect(*outputs)
+    for name, value in results.items():
+        if name == 'processed' and args.output:
+            lab1.export_data(value, args.output)
+            print(f"\n💾 Обработанные данные сохранены в файл: {args.output}")
+        else:
+            print(f"\n{name}:")
+            print(value)
+
+
+if __name__ == '__main__':
+    main()
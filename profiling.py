@@ -0,0 +1,236 @@
+"""Однопроходный профилировщик качества данных (раздел 2 lab1.py).
+
+Для каждого столбца за один векторизованный проход вычисляются все
+показатели: пропуски (NaN), нули, пустые и пробельные строки,
+служебные значения (unknown/none/null/n/a), минимум, максимум,
+отрицательные значения и значения вне допустимой области.
+Отчёты по разным частям данных объединяются методом merge().
+"""
+import numpy as np
+import pandas as pd
+
+# Шаблон "нулевых" значений в текстовых полях
+UNKNOWN_PATTERN = 'unknown|none|null|n/a'
+
+# Интерпретация нулевых значений в числовых полях
+ZERO_INTERPRETATIONS = {
+    'Survived': "0 = не выжил (валидное значение)",
+    'Pclass': "0 = невалидное значение (классы: 1,2,3)",
+    'Age': "0 = невалидное значение (возраст не может быть 0)",
+    'Siblings/Spouses Aboard': "0 = нет братьев/сестер/супругов (валидное значение)",
+    'Parents/Children Aboard': "0 = нет родителей/детей (валидное значение)",
+    'Fare': "0 = бесплатный билет (требует проверки)",
+}
+
+# Допустимые области значений: allowed - список значений (NaN считается
+# невалидным), min/max - границы (значения за границей считаются выходом)
+DOMAINS = {
+    'Pclass': {'allowed': [1, 2, 3]},
+    'Age': {'max': 100},
+    'Fare': {'min': 0},
+}
+
+# Показатели отчёта: счётчики складываются, min/max объединяются
+COUNT_METRICS = ['count', 'nan', 'zero', 'negative', 'out_of_domain',
+                 'empty', 'whitespace', 'sentinel']
+METRICS = ['kind'] + COUNT_METRICS + ['min', 'max']
+
+
+def _profile_numeric(values, domain):
+    """Показатели числового столбца за один проход по массиву"""
+    data = values.to_numpy(dtype='float64', na_value=np.nan)
+    nan_mask = np.isnan(data)
+    valid = data[~nan_mask]
+    # Знак значения: -1/0/1 -> количество отрицательных, нулевых, положительных
+    sign_counts = np.bincount((np.sign(valid) + 1).astype(np.intp), minlength=3)
+
+    out_of_domain = 0
+    if 'allowed' in domain:
+        out_of_domain = int(len(data) - np.isin(data, domain['allowed']).sum())
+    if 'min' in domain:
+        out_of_domain += int((valid < domain['min']).sum())
+    if 'max' in domain:
+        out_of_domain += int((valid > domain['max']).sum())
+
+    return {
+        'kind': 'numeric',
+        'count': len(data),
+        'nan': int(nan_mask.sum()),
+        'zero': int(sign_counts[1]),
+        'negative': int(sign_counts[0]),
+        'out_of_domain': out_of_domain,
+        'empty': 0,
+        'whitespace': 0,
+        'sentinel': 0,
+        'min': valid.min() if len(valid) else np.nan,
+        'max': valid.max() if len(valid) else np.nan,
+    }
+
+
+def _profile_text(values, sentinel_pattern):
+    """Показатели текстового столбца: строковые операции только над различными значениями"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    uniques = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    # Число строк с каждым различным значением (пропуски, код -1, не входят)
+    valid = codes >= 0
+    frequency = np.bincount(codes[valid], minlength=len(uniques))
+
+    lengths = uniques.str.len().to_numpy()
+    stripped_lengths = uniques.str.strip().str.len().to_numpy()
+    sentinel = uniques.str.contains(sentinel_pattern, case=False, na=False).to_numpy(dtype=bool)
+    empty = int(frequency[lengths == 0].sum())
+
+    return {
+        'kind': 'text',
+        'count': len(values),
+        'nan': int(len(codes) - np.count_nonzero(valid)),
+        'zero': 0,
+        'negative': 0,
+        'out_of_domain': 0,
+        'empty': empty,
+        'whitespace': int(frequency[stripped_lengths == 0].sum()) - empty,
+        'sentinel': int(frequency[sentinel].sum()),
+        'min': np.nan,
+        'max': np.nan,
+    }
+
+
+def _is_text(dtype):
+    """Текстовый столбец: object, строки или категории со строковыми значениями"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _is_text(dtype.categories.dtype)
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+class ProfileReport:
+    """Структурированный отчёт профилирования: строка на каждый столбец"""
+
+    def __init__(self, table, n_rows):
+        self.table = table
+        self.n_rows = n_rows
+
+    @property
+    def numeric_columns(self):
+        return list(self.table.index[self.table['kind'] == 'numeric'])
+
+    @property
+    def text_columns(self):
+        return list(self.table.index[self.table['kind'] == 'text'])
+
+    def merge(self, other):
+        """Объединение с отчётом по другой части тех же данных"""
+        table = self.table.copy()
+        table[COUNT_METRICS] = table[COUNT_METRICS] + other.table.loc[table.index, COUNT_METRICS]
+        table['min'] = np.fmin(table['min'], other.table.loc[table.index, 'min'])
+        table['max'] = np.fmax(table['max'], other.table.loc[table.index, 'max'])
+        return ProfileReport(table, self.n_rows + other.n_rows)
+
+    def missing_info(self):
+        """Таблица пропусков в формате раздела 2 lab1.py"""
+        missing_data = self.table['nan'].astype('int64')
+        return pd.DataFrame({
+            'Пропущено': missing_data,
+            'Процент': (missing_data / self.n_rows) * 100
+        })
+
+    def numeric_zero_summary(self):
+        """Сводка нулевых значений числовых полей с интерпретацией"""
+        return [{
+            'Поле': col,
+            'Нулевых значений': int(self.table.at[col, 'zero']),
+            'Процент': self.table.at[col, 'zero'] / self.n_rows * 100,
+            'Интерпретация': ZERO_INTERPRETATIONS.get(col, "требует анализа"),
+        } for col in self.numeric_columns]
+
+
+def profile_frame(df, domains=None, sentinel_pattern=UNKNOWN_PATTERN):
+    """Профилирование всех столбцов DataFrame, возвращает ProfileReport"""
+    if domains is None:
+        domains = DOMAINS
+    rows = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            rows[col] = _profile_numeric(values, domains.get(col, {}))
+        elif _is_text(values.dtype):
+            rows[col] = _profile_text(values, sentinel_pattern)
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=METRICS)
+    table = table.astype({**{m: 'int64' for m in COUNT_METRICS}, 'min': 'float64', 'max': 'float64'})
+    return ProfileReport(table, len(df))
+
+
+def print_report(report, violations=None):
+    """Вывод пунктов 1-3.3 раздела 2 lab1.py по отчёту профилирования.
+
+    violations - индекс нарушений quality.Violations: выходы за области
+    значений DOMAINS берутся из него, а не из счётчиков отчёта.
+    """
+    profile = report.table
+    n = report.n_rows
+    out_of_domain = profile['out_of_domain'] if violations is None else \
+        {col: violations.counts[f'{col}_domain'] for col in DOMAINS}
+
+    # Проверка NaN
+    print("\n1. Стандартные NaN значения:")
+    print(report.missing_info())
+
+    # Проверка пустых строк
+    print("\n2. Проверка пустых строк в текстовых полях:")
+    empty_found = False
+    for col in report.text_columns:
+        empty_count = profile.at[col, 'empty']
+        if empty_count > 0:
+            print(f"  {col}: {empty_count} пустых значений ({empty_count/n*100:.1f}%)")
+            empty_found = True
+    if not empty_found:
+        print("  Пустых строк не обнаружено")
+
+    # ДЕТАЛЬНАЯ ПРОВЕРКА НУЛЕВЫХ ЗНАЧЕНИЙ ВО ВСЕХ ПОЛЯХ
+    print("\n3. ДЕТАЛЬНАЯ ПРОВЕРКА НУЛЕВЫХ ЗНАЧЕНИЙ ВО ВСЕХ ПОЛЯХ:")
+
+    # Для числовых полей
+    print("\n3.1. Числовые поля:")
+    numeric_zero_summary = report.numeric_zero_summary()
+    for item in numeric_zero_summary:
+        if item['Нулевых значений'] > 0:
+            print(f"  {item['Поле']}: {item['Нулевых значений']} нулевых значений "
+                  f"({item['Процент']:.1f}%) - {item['Интерпретация']}")
+    print(f"\n  Всего числовых полей с нулевых значений: {len([x for x in numeric_zero_summary if x['Нулевых значений'] > 0])}")
+
+    # Для текстовых полей - проверка на "нулевые" строки
+    print("\n3.2. Текстовые поля:")
+    for col in report.text_columns:
+        empty_count = profile.at[col, 'empty']
+        whitespace_count = profile.at[col, 'whitespace']
+        unknown_count = profile.at[col, 'sentinel']
+
+        if empty_count > 0 or whitespace_count > 0 or unknown_count > 0:
+            print(f"  {col}:")
+            if empty_count > 0:
+                print(f"    - Пустых строк: {empty_count}")
+            if whitespace_count > 0:
+                print(f"    - Только пробелы: {whitespace_count}")
+            if unknown_count > 0:
+                print(f"    - Содержит 'unknown/none': {unknown_count}")
+
+    print("\n3.3. Анализ аномальных значений:")
+    print("Возраст (Age):")
+    print(f"  Минимальный возраст: {profile.at['Age', 'min']:.2f}")
+    print(f"  Максимальный возраст: {profile.at['Age', 'max']:.2f}")
+    print(f"  Возраст = 0: {profile.at['Age', 'zero']}")
+    print(f"  Отрицательный возраст: {profile.at['Age', 'negative']}")
+    print(f"  Возраст > 100: {out_of_domain['Age']}")
+
+    print("\nСтоимость билета (Fare):")
+    print(f"  Минимальная стоимость: {profile.at['Fare', 'min']:.2f}")
+    print(f"  Максимальная стоимость: {profile.at['Fare', 'max']:.2f}")
+    fare_zeros = profile.at['Fare', 'zero']
+    print(f"  Стоимость = 0: {fare_zeros} ({fare_zeros/n*100:.1f}%)")
+    print(f"  Отрицательная стоимость: {out_of_domain['Fare']}")
+
+    print("\nКласс (Pclass):")
+    print(f"  Класс = 0: {profile.at['Pclass', 'zero']}")
+    print(f"  Невалидные классы (не 1,2,3): {out_of_domain['Pclass']}")
@@ -0,0 +1,319 @@
+"""Правила качества данных и индекс нарушений (раздел 2 lab1.py).
+
+Правила (диапазон, допустимые значения, регулярное выражение, пропуски,
+условие на несколько столбцов) объявляются один раз в списке RULES.
+RuleSet подготавливает каждый нужный столбец один раз на часть данных
+(числовые - массив float64, текстовые - коды и различные значения) и
+заполняет одну матрицу нарушений "правило x строка": каждое правило
+пишет свою строку матрицы универсальными функциями NumPy через out=,
+регулярные выражения и допустимые значения текстовых столбцов
+проверяются только на различных значениях. Пропуски нарушением не
+считаются, кроме NotNullRule и DomainRule (пропуск не входит в список
+допустимых значений, как в profiling.DOMAINS).
+
+Результат - Violations: по битовой маске на правило (np.packbits, 1 бит
+на строку). По индексу нарушений строки отбираются или отправляются в
+карантин без повторной проверки данных; индексы частей файла
+объединяются один раз в конце (Violations.concat).
+
+Запуск:
+    python quality.py titanic.csv --quarantine rejected.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_table, write_table
+from profiling import DOMAINS
+
+
+class _Column:
+    """Столбец, подготовленный для проверки: массив float64 или коды и различные значения"""
+
+    def __init__(self, values):
+        dtype = values.dtype
+        self.numeric = pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+        if self.numeric:
+            self.values = values.to_numpy(dtype='float64', na_value=np.nan)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            self.codes, self.uniques = values.cat.codes.to_numpy(), values.cat.categories.to_numpy()
+        else:
+            self.codes, self.uniques = pd.factorize(values)
+
+    def isnull(self, out):
+        if self.numeric:
+            return np.isnan(self.values, out=out)
+        return np.less(self.codes, 0, out=out)
+
+    def take(self, flags, out, null=False):
+        """Признак строки по признакам различных значений (пропуск - null)"""
+        np.take(np.append(flags, null), self.codes, out=out)
+        return out
+
+    def data(self):
+        """Значения для условий на несколько столбцов"""
+        if self.numeric:
+            return self.values
+        return pd.Categorical.from_codes(self.codes, categories=self.uniques, validate=False)
+
+
+class Rule:
+    """Правило качества: имя, проверяемые столбцы и маска нарушений"""
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = list(columns)
+
+    def evaluate(self, column, out):
+        """Запись маски нарушений в out (bool, длина - число строк)"""
+        raise NotImplementedError
+
+
+class RangeRule(Rule):
+    """Значения в диапазоне [low, high]; inclusive - как в Series.between()"""
+
+    def __init__(self, column, low=None, high=None, inclusive='both', name=None):
+        super().__init__(name or f'{column}_range', [column])
+        self.low = low
+        self.high = high
+        self.inclusive = inclusive
+
+    def evaluate(self, column, out):
+        if not column.numeric:
+            raise TypeError(f"Правило '{self.name}': столбец {self.columns[0]} не числовой")
+        out[:] = False
+        if self.low is not None:
+            below = np.less if self.inclusive in ('both', 'left') else np.less_equal
+            below(column.values, self.low, out=out)
+        if self.high is not None:
+            above = np.greater if self.inclusive in ('both', 'right') else np.greater_equal
+            out |= above(column.values, self.high)
+        return out
+
+
+class DomainRule(Rule):
+    """Значения из списка allowed (пропуск - нарушение)"""
+
+    def __init__(self, column, allowed, name=None):
+        super().__init__(name or f'{column}_domain', [column])
+        self.allowed = list(allowed)
+
+    def evaluate(self, column, out):
+        if not column.numeric:
+            return column.take(~np.isin(column.uniques, self.allowed), out, null=True)
+        out[:] = np.isin(column.values, self.allowed, invert=True)
+        return out
+
+
+class RegexRule(Rule):
+    """Текстовые значения, полностью соответствующие регулярному выражению pattern"""
+
+    def __init__(self, column, pattern, name=None):
+        super().__init__(name or f'{column}_format', [column])
+        self.pattern = pattern
+
+    def evaluate(self, column, out):
+        if column.numeric:
+            raise TypeError(f"Правило '{self.name}': столбец {self.columns[0]} не текстовый")
+        matched = pd.Series(column.uniques, dtype=object).str.fullmatch(self.pattern).to_numpy(dtype=bool)
+        return column.take(~matched, out)
+
+
+class NotNullRule(Rule):
+    """Значения без пропусков"""
+
+    def __init__(self, column, name=None):
+        super().__init__(name or f'{column}_notnull', [column])
+
+    def evaluate(self, column, out):
+        return column.isnull(out)
+
+
+class CrossRule(Rule):
+    """Условие на несколько столбцов: func(*значения) - маска нарушений.
+
+    Числовые столбцы передаются массивами float64 (пропуски - NaN),
+    текстовые - как Categorical.
+    """
+
+    def __init__(self, name, columns, func):
+        super().__init__(name, columns)
+        self.func = func
+
+    def evaluate(self, *columns, out):
+        out[:] = self.func(*(column.data() for column in columns))
+        return out
+
+
+def domain_rules(domains=DOMAINS):
+    """Правила по допустимым областям profiling.DOMAINS (allowed, min, max)"""
+    rules = []
+    for col, domain in domains.items():
+        if 'allowed' in domain:
+            rules.append(DomainRule(col, domain['allowed']))
+        else:
+            rules.append(RangeRule(col, domain.get('min'), domain.get('max'), name=f'{col}_domain'))
+    return rules
+
+
+# Пассажир младше этого возраста без родителей на борту требует проверки
+INFANT_AGE = 5
+
+# Правила по умолчанию: области значений раздела 2 и формат данных Титаника
+RULES = domain_rules() + [
+    RangeRule('Age', low=0, inclusive='neither', name='Age_positive'),
+    DomainRule('Survived', [0, 1]),
+    DomainRule('Sex', ['male', 'female']),
+    NotNullRule('Name'),
+    RegexRule('Name', r'(?:the\s+)?[^.\s]+\.\s+\S.*'),
+    CrossRule('Infant_alone', ['Age', 'Parents/Children Aboard'],
+              lambda age, parents: (age < INFANT_AGE) & (parents == 0)),
+]
+
+
+class Violations:
+    """Индекс нарушений: битовая маска строк на каждое правило"""
+
+    def __init__(self, names, bitmaps, n_rows):
+        self.names = list(names)
+        self.bitmaps = bitmaps
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_matrix(cls, names, matrix):
+        return cls(names, np.packbits(matrix, axis=1, bitorder='little'), matrix.shape[1])
+
+    def matrix(self):
+        """Матрица нарушений "правило x строка" (bool)"""
+        return np.unpackbits(self.bitmaps, axis=1, count=self.n_rows, bitorder='little').view(bool)
+
+    @property
+    def counts(self):
+        """Число нарушений каждого правила"""
+        return pd.Series(np.count_nonzero(self.matrix(), axis=1), index=self.names, dtype='int64')
+
+    def mask(self, name=None):
+        """Маска строк, нарушающих правило name (None - хотя бы одно правило)"""
+        if name is None:
+            bitmap = np.bitwise_or.reduce(self.bitmaps, axis=0)
+        else:
+            bitmap = self.bitmaps[self.names.index(name)]
+        return np.unpackbits(bitmap, count=self.n_rows, bitorder='little').view(bool)
+
+    def rows(self, name=None):
+        """Номера строк (позиции) с нарушениями правила name (None - любого)"""
+        return np.flatnonzero(self.mask(name))
+
+    def filter(self, df):
+        """Строки df без нарушений"""
+        return df[~self.mask()]
+
+    def quarantine(self, df):
+        """Строки df с нарушениями и столбцом 'Нарушения' (имена правил через запятую)"""
+        rows = self.rows()
+        rejected = df.iloc[rows].copy()
+        broken = self.matrix()[:, rows]
+        names = np.array(self.names, dtype=object)
+        rejected['Нарушения'] = [', '.join(names[broken[:, i]]) for i in range(len(rows))]
+        return rejected
+
+    @classmethod
+    def concat(cls, parts):
+        """Индекс последовательных частей данных: строки нумеруются подряд по частям"""
+        names = parts[0].names
+        if any(part.names != names for part in parts):
+            raise ValueError("Индексы нарушений построены по разным правилам")
+        n_rows = sum(part.n_rows for part in parts)
+        if all(part.n_rows % 8 == 0 for part in parts[:-1]):
+            # Части кратны байту: битовые маски склеиваются без распаковки
+            return cls(names, np.concatenate([part.bitmaps for part in parts], axis=1), n_rows)
+        return cls.from_matrix(names, np.concatenate([part.matrix() for part in parts], axis=1))
+
+    def merge(self, other):
+        """Индекс следующей части данных: строки other нумеруются после строк self"""
+        return Violations.concat([self, other])
+
+    def to_dict(self):
+        return {
+            'rows': self.n_rows,
+            'violations': {name: self.rows(name).tolist() for name in self.names},
+        }
+
+    @classmethod
+    def from_dict(cls, params):
+        matrix = np.zeros((len(params['violations']), params['rows']), dtype=bool)
+        for i, rows in enumerate(params['violations'].values()):
+            matrix[i, rows] = True
+        return cls.from_matrix(list(params['violations']), matrix)
+
+
+class RuleSet:
+    """Скомпилированный набор правил: одна матрица нарушений на часть данных"""
+
+    def __init__(self, rules=RULES):
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Повторяющиеся имена правил: {', '.join(duplicates)}")
+        self.names = names
+        # Каждый столбец подготавливается один раз для всех правил
+        self.columns = list(dict.fromkeys(col for rule in self.rules for col in rule.columns))
+
+    def check(self, df):
+        """Индекс нарушений Violations для df"""
+        missing = [col for col in self.columns if col not in df.columns]
+        if missing:
+            raise KeyError(f"Для проверки правил нет столбцов: {', '.join(missing)}")
+        columns = {col: _Column(df[col]) for col in self.columns}
+        matrix = np.empty((len(self.rules), len(df)), dtype=bool)
+        for rule, out in zip(self.rules, matrix):
+            rule.evaluate(*(columns[col] for col in rule.columns), out=out)
+        return Violations.from_matrix(self.names, matrix)
+
+
+def check_rules(df, rules=RULES):
+    """Проверка df правилами rules, возвращает Violations"""
+    return RuleSet(rules).check(df)
+
+
+def main():
+    from streaming import CHUNK_SIZE, read_chunks
+
+    parser = argparse.ArgumentParser(description='Проверка данных правилами качества')
+    parser.add_argument('path', nargs='?', default='titanic.csv', help='входной файл (.csv, .parquet, .feather, .cols)')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help='строк в части CSV-файла')
+    parser.add_argument('--quarantine', help='файл для строк с нарушениями')
+    args = parser.parse_args()
+
+    rules = RuleSet()
+    start = time.perf_counter()
+    if args.path.endswith('.csv'):
+        chunks = read_chunks(args.path, args.chunksize)
+    else:
+        chunks = [read_table(args.path, rules.columns if not args.quarantine else None)]
+    parts, rejected = [], []
+    for chunk in chunks:
+        part = rules.check(chunk)
+        if args.quarantine and part.rows().size:
+            rejected.append(part.quarantine(chunk))
+        parts.append(part)
+    violations = Violations.concat(parts)
+    elapsed = time.perf_counter() - start
+
+    n = violations.n_rows
+    print(f"✓ Проверено строк: {n} за {elapsed:.2f} с ({n / elapsed / 1e6 * 60:.1f} млн строк/мин)")
+    for name, count in violations.counts.items():
+        print(f"  {name}: {count} ({count / n * 100:.2f}%)")
+    print(f"  Строк с нарушениями: {len(violations.rows())}")
+
+    if args.quarantine:
+        frame = pd.concat(rejected) if rejected else pd.DataFrame(columns=['Нарушения'])
+        write_table(frame, args.quarantine)
+        print(f"\n💾 Строки с нарушениями сохранены в файл: {args.quarantine}")
+
+
+if __name__ == '__main__':
+    main()
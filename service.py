@@ -0,0 +1,450 @@
+"""HTTP-сервис с результатами конвейера lab1.py (asyncio, без внешних зависимостей).
+
+При запуске конвейер обучается на исходном файле: медианы групп для
+заполнения пропусков (2.1), границы IQR (5.1) и куб выживаемости
+(cube.SurvivalCube) хранятся в памяти. Запросы на обработку отдельных
+пассажиров не обрабатываются по одному: они копятся в очереди и
+обрабатываются пачкой (до max_batch строк или max_wait секунд ожидания)
+одним векторизованным вызовом lab1.run_pipeline() с обученными
+параметрами.
+
+Точки доступа:
+    POST /transform  - пассажир (JSON-объект) или список пассажиров
+    GET  /stats      - выживаемость: ?by=Pclass,Sex&AgeGroup=... (срез куба)
+    GET  /bounds     - медианы групп и границы выбросов
+    GET  /metrics    - перцентили задержки и размеры пачек
+    GET  /health
+
+Запуск:
+    python service.py titanic.csv --port 8080 --max-batch 256 --max-wait-ms 2
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import lab1
+from cube import SurvivalCube
+from imputation import load_imputers
+from instrumentation import span
+from outliers import load_clipper
+from plan import NUMERIC_COLUMNS, RAW_COLUMNS
+from streaming import _as_tuple
+
+# Целочисленные столбцы (float64, если в пачке есть пропуски)
+INTEGER_COLUMNS = ['Survived', 'Pclass', 'Siblings/Spouses Aboard', 'Parents/Children Aboard']
+
+# Размер пачки и время ожидания её заполнения
+MAX_BATCH = 256
+MAX_WAIT = 0.002
+
+# Число последних запросов для перцентилей задержки
+LATENCY_WINDOW = 10_000
+
+# Наибольший размер тела запроса (байт)
+MAX_BODY = 16 * 1024 * 1024
+
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+          413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def _json_value(value):
+    """Значение numpy/pandas в виде, пригодном для JSON (NaN -> null)"""
+    if isinstance(value, (np.generic,)):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _records(df):
+    """Строки df в виде списка словарей (по столбцам, без поэлементного доступа pandas)"""
+    columns = list(df.columns)
+    values = [df[col].tolist() for col in columns]
+    return [{col: None if value != value else value for col, value in zip(columns, row)}
+            for row in zip(*values)]
+
+
+# =============================================================================
+# ОБУЧЕННАЯ МОДЕЛЬ
+# =============================================================================
+
+class PipelineModel:
+    """Обученные параметры конвейера и агрегаты выживаемости"""
+
+    def __init__(self, imputers, clipper, cube):
+        self.imputers = imputers
+        self.clipper = clipper
+        self.cube = cube
+
+    @classmethod
+    def fit(cls, path=lab1.INPUT_PATH, imputers_path=None, clipper_path=None):
+        """Обучение на файле path; импутеры и границы можно загрузить из JSON"""
+        df = lab1.load_data(path)
+        imputers = load_imputers(imputers_path) if imputers_path else lab1.fit_imputers(df)
+        df_processed = lab1.impute_missing(df, imputers=imputers)
+        clipper = load_clipper(clipper_path) if clipper_path else None
+        df_processed, clipper = lab1.clip_outliers(df_processed, clipper)
+        df_processed = lab1.engineer_features(df_processed)
+        return cls(imputers, clipper, SurvivalCube.from_frame(df_processed))
+
+    def frame(self, passengers):
+        """DataFrame исходных столбцов из списка словарей пассажиров"""
+        unknown = {key for passenger in passengers for key in passenger} - set(RAW_COLUMNS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+        data = {}
+        for col in RAW_COLUMNS:
+            values = [passenger.get(col) for passenger in passengers]
+            if col in NUMERIC_COLUMNS:
+                try:
+                    values = np.array(values, dtype='float64')
+                except (TypeError, ValueError):
+                    raise ValueError(f"Нечисловое значение в поле '{col}'") from None
+                if col in INTEGER_COLUMNS and not np.isnan(values).any():
+                    values = values.astype('int64')
+            else:
+                values = np.array(values, dtype=object)
+            data[col] = values
+        return pd.DataFrame(data)
+
+    def transform(self, passengers):
+        """Обработка пачки пассажиров (разделы 2.1, 5.1 и 6), список словарей"""
+        df_processed = lab1.run_pipeline(self.frame(passengers), self.imputers, self.clipper)
+        df_processed['AgeGroup'] = df_processed['AgeGroup'].astype(object)
+        return _records(df_processed)
+
+    def stats(self, by=None, **filters):
+        """Выживаемость в срезе куба; by - список измерений для группировки"""
+        filters = {dim: self._level_values(dim, value) for dim, value in filters.items()}
+        survived, count = self.cube.totals(**filters)
+        result = {'survived': survived, 'count': count, 'rate': _json_value(survived / count if count else np.nan)}
+        if by:
+            table = self.cube.table(by, **filters)
+            result['groups'] = [
+                {**dict(zip(by, (_json_value(v) for v in _as_tuple(key)))), 'rate': float(mean), 'count': int(n)}
+                for key, mean, n in zip(table.index, table['mean'], table['count'])
+            ]
+        return result
+
+    def _level_values(self, dim, text):
+        """Значения измерения по строкам запроса ('1,2' -> [1, 2])"""
+        levels = self.cube.levels[self.cube._axis(dim)]
+        by_text = {str(value): value for value in levels}
+        return [by_text[part] for part in text.split(',') if part in by_text]
+
+    def bounds(self):
+        return {
+            'imputation': [
+                {'column': imputer.column, 'by': imputer.by, 'strategy': imputer.strategy,
+                 'groups': imputer.to_dict()['stats']}
+                for imputer in self.imputers
+            ],
+            'outliers': {
+                output: dict(zip(['Q1', 'Q3', 'IQR', 'lower', 'upper'], stats))
+                for output, stats in self.clipper.stats_.items()
+            },
+        }
+
+
+# =============================================================================
+# МЕТРИКИ
+# =============================================================================
+
+class ServiceMetrics:
+    """Задержки последних запросов и размеры пачек"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.max_batch = 0
+        # Гистограмма размеров пачек: верхняя граница (степень двойки) -> число пачек
+        self.batch_sizes = {}
+
+    def observe_request(self, seconds, error=False):
+        self.requests += 1
+        self.errors += error
+        self.latencies.append(seconds)
+
+    def observe_batch(self, rows):
+        self.batches += 1
+        self.batch_rows += rows
+        self.max_batch = max(self.max_batch, rows)
+        bucket = 1 << max(rows - 1, 0).bit_length()
+        self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+
+    def to_dict(self):
+        latencies = np.fromiter(self.latencies, dtype='float64') * 1000
+        if len(latencies):
+            p50, p90, p99, p999 = np.percentile(latencies, [50, 90, 99, 99.9])
+            latency = {'p50': p50, 'p90': p90, 'p99': p99, 'p99.9': p999, 'max': latencies.max(),
+                       'window': len(latencies)}
+        else:
+            latency = {}
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {key: _json_value(value) for key, value in latency.items()},
+            'batches': self.batches,
+            'batch_rows': self.batch_rows,
+            'batch_mean': self.batch_rows / self.batches if self.batches else 0.0,
+            'batch_max': self.max_batch,
+            'batch_sizes': {f'<={bucket}': count for bucket, count in sorted(self.batch_sizes.items())},
+        }
+
+
+# =============================================================================
+# ОБЪЕДИНЕНИЕ ЗАПРОСОВ В ПАЧКИ
+# =============================================================================
+
+class MicroBatcher:
+    """Очередь пассажиров, обрабатываемая пачками одним вызовом func"""
+
+    def __init__(self, func, metrics, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.func = func
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, passengers):
+        """Постановка пассажиров одного запроса в очередь, возвращает их обработанные записи"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((passengers, future))
+        return await future
+
+    async def _collect(self):
+        """Пачка запросов: первый ждётся без ограничения, остальные - не дольше max_wait"""
+        items = [await self.queue.get()]
+        rows = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch:
+            if self.queue.empty():
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            items.append(item)
+            rows += len(item[0])
+        return items, rows
+
+    async def _run(self):
+        # Пачка обрабатывается в отдельном потоке: цикл событий тем временем
+        # принимает новые запросы и отвечает на /metrics, /health
+        while True:
+            items, rows = await self._collect()
+            passengers = [passenger for request, _ in items for passenger in request]
+            try:
+                with span('batch', 'service', rows=rows):
+                    records = await asyncio.to_thread(self.func, passengers)
+            except Exception:
+                # Ошибка в пачке: запросы обрабатываются по отдельности, чтобы
+                # неверные данные одного клиента не влияли на остальных
+                for request, future in items:
+                    try:
+                        result = await asyncio.to_thread(self.func, request)
+                    except Exception as exc:
+                        if not future.done():
+                            future.set_exception(exc)
+                    else:
+                        if not future.done():
+                            future.set_result(result)
+            else:
+                start = 0
+                for request, future in items:
+                    if not future.done():
+                        future.set_result(records[start:start + len(request)])
+                    start += len(request)
+            self.metrics.observe_batch(rows)
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PipelineService:
+    """HTTP/1.1 сервер (keep-alive) поверх asyncio.start_server"""
+
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.model = model
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(model.transform, self.metrics, max_batch, max_wait)
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def handle(self, method, target, body):
+        """Ответ (код, объект для JSON) на запрос"""
+        url = urlsplit(target)
+        if url.path == '/transform':
+            if method != 'POST':
+                raise HTTPError(405, 'Нужен метод POST')
+            try:
+                payload = json.loads(body)
+            except ValueError as exc:
+                raise HTTPError(400, f'Неверный JSON: {exc}') from None
+            single = isinstance(payload, dict)
+            passengers = [payload] if single else payload
+            if not isinstance(passengers, list) or not all(isinstance(p, dict) for p in passengers):
+                raise HTTPError(400, 'Ожидается объект пассажира или список объектов')
+            if not passengers:
+                return 200, []
+            try:
+                records = await self.batcher.submit(passengers)
+            except (ValueError, TypeError, KeyError) as exc:
+                raise HTTPError(400, str(exc)) from None
+            return 200, records[0] if single else records
+
+        if method != 'GET':
+            raise HTTPError(405, 'Нужен метод GET')
+        if url.path == '/stats':
+            params = dict(parse_qsl(url.query))
+            by = params.pop('by', '')
+            try:
+                return 200, self.model.stats([dim for dim in by.split(',') if dim], **params)
+            except KeyError as exc:
+                raise HTTPError(400, exc.args[0]) from None
+        if url.path == '/bounds':
+            return 200, self.model.bounds()
+        if url.path == '/metrics':
+            return 200, self.metrics.to_dict()
+        if url.path == '/health':
+            return 200, {'status': 'ok'}
+        raise HTTPError(404, f'Нет точки доступа {url.path}')
+
+    async def _read_request(self, reader):
+        """(метод, путь, заголовки, тело) или None при закрытии соединения"""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HTTPError(400, 'Неверная строка запроса') from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY:
+            raise HTTPError(413, f'Тело запроса больше {MAX_BODY} байт')
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as exc:
+                    self._write(writer, exc.status, {'error': str(exc)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                start = time.perf_counter()
+                try:
+                    status, result = await self.handle(method, target, body)
+                except HTTPError as exc:
+                    status, result = exc.status, {'error': str(exc)}
+                except Exception as exc:
+                    status, result = 500, {'error': f'{type(exc).__name__}: {exc}'}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write(writer, status, result, keep_alive)
+                await writer.drain()
+                if not target.startswith('/metrics'):
+                    self.metrics.observe_request(time.perf_counter() - start, error=status >= 400)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write(writer, status, result, keep_alive=True):
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+
+async def serve(model, host='127.0.0.1', port=8080, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+    """Запуск сервиса до прерывания"""
+    service = PipelineService(model, max_batch, max_wait)
+    server = await service.start(host, port)
+    print(f"✓ Сервис запущен: http://{host}:{port} (пачка до {max_batch} строк, ожидание {max_wait * 1000:g} мс)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP-сервис с результатами анализа Титаника')
+    parser.add_argument('path', nargs='?', default=lab1.INPUT_PATH, help='файл для обучения конвейера')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help='наибольший размер пачки (строк)')
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT * 1000,
+                        help='время ожидания заполнения пачки (мс)')
+    parser.add_argument('--imputers', help='JSON-файл обученных импутеров (save_imputers)')
+    parser.add_argument('--clipper', help='JSON-файл обученных границ выбросов (save_clipper)')
+    args = parser.parse_args()
+
+    model = PipelineModel.fit(args.path, args.imputers, args.clipper)
+    try:
+        asyncio.run(serve(model, args.host, args.port, args.max_batch, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        print("\n✓ Сервис остановлен")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Приближённые квантили за один проход: скетч KLL.
+
+Скетч хранит уровни-компакторы: элемент уровня h представляет 2^h
+исходных значений. Переполненный уровень сортируется, и каждый второй
+элемент (со случайным сдвигом) переносится на уровень выше. Память
+ограничена O(k log(n/k)), а ошибка ранга любого квантиля не превышает
+RANK_ERROR_COEF / k^RANK_ERROR_EXP с вероятностью 99% (оценка Apache
+DataSketches). Скетчи объединяются (merge) между частями файла и
+процессами. Пока сжатие не понадобилось, квантили точные и совпадают с
+Series.quantile() и Series.median().
+"""
+import numpy as np
+
+# Допустимая ошибка ранга по умолчанию (доля)
+DEFAULT_ERROR = 0.01
+
+# Оценка ошибки ранга KLL: RANK_ERROR_COEF / k ** RANK_ERROR_EXP
+RANK_ERROR_COEF = 2.296
+RANK_ERROR_EXP = 0.9723
+
+# Вместимость уровня уменьшается в CAPACITY_DECAY раз на каждый уровень вниз
+CAPACITY_DECAY = 2 / 3
+MIN_CAPACITY = 2
+MIN_K = 8
+
+
+def k_for_error(error):
+    """Наименьший параметр k, обеспечивающий ошибку ранга не больше error"""
+    if not 0 < error < 1:
+        raise ValueError(f"Ошибка ранга должна быть в интервале (0, 1), задана {error}")
+    return max(MIN_K, int(np.ceil((RANK_ERROR_COEF / error) ** (1 / RANK_ERROR_EXP))))
+
+
+def rank_error_for_k(k):
+    """Ошибка ранга скетча с параметром k (99% доверия)"""
+    return RANK_ERROR_COEF / k ** RANK_ERROR_EXP
+
+
+class KLLSketch:
+    """Объединяемый скетч квантилей числового столбца (пропуски игнорируются)"""
+
+    def __init__(self, error=DEFAULT_ERROR, seed=0):
+        self.error = error
+        self.k = k_for_error(error)
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    @property
+    def size(self):
+        """Число хранимых элементов"""
+        return sum(len(items) for items in self.levels)
+
+    @property
+    def exact(self):
+        """Хранятся ли все значения (сжатие ещё не выполнялось)"""
+        return len(self.levels[0]) == self.n
+
+    @property
+    def rank_error(self):
+        """Гарантированная ошибка ранга квантилей (0, если скетч точный)"""
+        return 0.0 if self.exact else rank_error_for_k(self.k)
+
+    def _compact(self, level):
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        items = np.sort(self.levels[level])
+        odd = len(items) % 2
+        promoted = items[odd + self._rng.integers(2)::2]
+        self.levels[level] = items[:odd]
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _compress(self):
+        while self.size > sum(self._capacity(level) for level in range(len(self.levels))):
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    self._compact(level)
+                    break
+
+    def update(self, values):
+        """Добавление значений (массив, Series или число)"""
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Объединение со скетчем другой части данных (тот же error)"""
+        if other.k != self.k:
+            raise ValueError(f"Нельзя объединить скетчи с разными k: {self.k} и {other.k}")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Квантиль уровня q (точный, пока сжатие не выполнялось)"""
+        if self.n == 0:
+            return np.nan
+        if self.exact:
+            return float(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cum = np.cumsum(weights[order])
+        idx = min(int(np.searchsorted(cum, q * cum[-1], side='left')), len(items) - 1)
+        return float(items[order][idx])
+
+    def median(self):
+        """Медиана (в точном режиме - как Series.median())"""
+        if self.exact and self.n:
+            return float(np.median(self.levels[0]))
+        return self.quantile(0.5)
+
+    def quantile_bounds(self, q):
+        """Интервал значений, в котором с гарантией ошибки ранга лежит истинный квантиль"""
+        error = self.rank_error
+        return self.quantile(max(0.0, q - error)), self.quantile(min(1.0, q + error))
@@ -0,0 +1,430 @@
+"""Потоковый анализ CSV-файла пассажиров по частям (chunks).
+
+Используется для файлов, которые не помещаются в память целиком.
+Все показатели разделов 2 и 3 из lab1.py накапливаются в объединяемых
+аккумуляторах, поэтому пиковое потребление памяти зависит от размера
+части и числа различных значений в столбцах, а не от размера файла.
+
+Запуск:
+    python streaming.py titanic.csv --chunksize 100000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from imputation import GroupImputer
+from outliers import OutlierClipper, sketch_bounds
+from profiling import print_report, profile_frame
+
+# Размер части по умолчанию (строк)
+CHUNK_SIZE = 100_000
+
+# Схема входного файла
+TEXT_COLUMNS = ['Name', 'Sex']
+NUMERIC_COLUMNS = ['Survived', 'Pclass', 'Age', 'Siblings/Spouses Aboard',
+                   'Parents/Children Aboard', 'Fare']
+
+
+def _merge_counts(left, right):
+    """Сложение двух Series-счётчиков с выравниванием по индексу"""
+    if len(left) == 0:
+        return right
+    if len(right) == 0:
+        return left
+    return pd.concat([left, right]).groupby(level=list(range(left.index.nlevels)), sort=False, observed=True).sum()
+
+
+def _lerp(a, b, t):
+    """Линейная интерполяция с тем же порядком операций, что и в numpy.quantile"""
+    diff = b - a
+    return b - diff * (1 - t) if t >= 0.5 else a + diff * t
+
+
+def _as_tuple(key):
+    """Ключ группы в виде кортежа (для группировки по одному столбцу)"""
+    return key if isinstance(key, tuple) else (key,)
+
+
+class ValueCounter:
+    """Объединяемая гистограмма значений числового столбца.
+
+    Хранит пары (значение, количество), поэтому позволяет точно
+    вычислить count/mean/std/min/квартили/max так же, как describe().
+    Значения хранятся отсортированным массивом: добавление уже
+    встречавшихся значений обновляет счётчики на месте (время зависит от
+    размера добавляемой части), новые значения вставляются по позициям
+    searchsorted без пересортировки всей гистограммы.
+    """
+
+    def __init__(self):
+        self.values = np.empty(0, dtype='float64')
+        self.frequencies = np.empty(0, dtype='int64')
+
+    @property
+    def counts(self):
+        """Гистограмма в виде Series: значение -> количество"""
+        return pd.Series(self.frequencies, index=self.values, dtype='int64')
+
+    def _add(self, values, counts):
+        """Добавление значений values с количествами counts (любой порядок, возможны повторы)"""
+        values, inverse = np.unique(np.asarray(values, dtype='float64'), return_inverse=True)
+        counts = np.bincount(inverse, weights=counts, minlength=len(values)).astype('int64')
+        positions = np.searchsorted(self.values, values)
+        found = positions < len(self.values)
+        found[found] = self.values[positions[found]] == values[found]
+        self.frequencies[positions[found]] += counts[found]
+        if not found.all():
+            new = ~found
+            self.values = np.insert(self.values, positions[new], values[new])
+            self.frequencies = np.insert(self.frequencies, positions[new], counts[new])
+
+    def update(self, values):
+        counts = values.value_counts(dropna=True)
+        if len(counts):
+            self._add(counts.index.to_numpy(dtype='float64'), counts.to_numpy(dtype='int64'))
+
+    def add(self, value, count):
+        """Добавление значения value в количестве count (для импутации)"""
+        if count > 0 and not pd.isna(value):
+            self._add([value], [count])
+
+    def merge(self, other):
+        if len(other.values):
+            self._add(other.values, other.frequencies)
+        return self
+
+    def apply(self, func):
+        """Гистограмма значений func(x), func - имя функции numpy (новый объект)"""
+        counter = ValueCounter()
+        counter._add(getattr(np, func)(self.values), self.frequencies)
+        return counter
+
+    def _sorted(self):
+        return self.values, self.frequencies
+
+    @property
+    def count(self):
+        return int(self.frequencies.sum())
+
+    def quantile(self, q):
+        """Квантиль с линейной интерполяцией (как Series.quantile)"""
+        values, counts = self._sorted()
+        if len(values) == 0:
+            return np.nan
+        cum = counts.cumsum()
+        pos = (cum[-1] - 1) * q
+        lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+        v_lo = values[np.searchsorted(cum, lo, side='right')]
+        v_hi = values[np.searchsorted(cum, hi, side='right')]
+        return _lerp(v_lo, v_hi, pos - lo)
+
+    def median(self):
+        """Медиана как Series.median() и groupby().median(): среднее двух средних значений"""
+        values, counts = self._sorted()
+        if len(values) == 0:
+            return np.nan
+        cum = counts.cumsum()
+        v_lo = values[np.searchsorted(cum, (cum[-1] - 1) // 2, side='right')]
+        v_hi = values[np.searchsorted(cum, cum[-1] // 2, side='right')]
+        return (v_lo + v_hi) / 2
+
+    def describe(self):
+        """Аналог Series.describe() для числового столбца"""
+        values, counts = self._sorted()
+        n = counts.sum()
+        if n == 0:
+            stats = [0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]
+        else:
+            mean = (values * counts).sum() / n
+            std = np.sqrt((counts * (values - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+            stats = [n, mean, std, values[0], self.quantile(0.25),
+                     self.quantile(0.5), self.quantile(0.75), values[-1]]
+        return pd.Series(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                         dtype='float64')
+
+
+class GroupSurvival:
+    """Объединяемый счётчик выживаемости по группам (sum и count)"""
+
+    def __init__(self):
+        self.stats = pd.DataFrame(columns=['sum', 'count'], dtype='int64')
+
+    def update(self, keys, survived):
+        part = survived.groupby(keys, observed=True).agg(['sum', 'count'])
+        self.merge_frame(part)
+
+    def merge_frame(self, part):
+        if len(self.stats) == 0:
+            self.stats = part.astype('int64')
+        elif len(part) > 0:
+            self.stats = pd.concat([self.stats, part]).groupby(level=list(range(part.index.nlevels))).sum()
+
+    def merge(self, other):
+        self.merge_frame(other.stats)
+        return self
+
+    def table(self):
+        """Таблица mean/count, как groupby(...)['Survived'].agg(['mean', 'count'])"""
+        stats = self.stats.sort_index()
+        return pd.DataFrame({'mean': stats['sum'] / stats['count'], 'count': stats['count']})
+
+
+class GroupMedianImputer:
+    """Накопление гистограмм по группам для импутации медианой группы"""
+
+    def __init__(self, value_column, group_columns):
+        self.value_column = value_column
+        self.group_columns = group_columns
+        self.values = {}
+        self.missing = pd.Series(dtype='int64')
+        self._medians = {}
+
+    def update(self, chunk):
+        keys = [chunk[col] for col in self.group_columns]
+        for key, values in chunk.groupby(keys, observed=True)[self.value_column]:
+            self.values.setdefault(key, ValueCounter()).update(values)
+            self._medians.pop(_as_tuple(key), None)
+        nan_mask = chunk[self.value_column].isna()
+        if nan_mask.any():
+            nan_keys = [chunk.loc[nan_mask, col] for col in self.group_columns]
+            self.missing = _merge_counts(self.missing, chunk[nan_mask].groupby(nan_keys, observed=True).size())
+
+    def merge(self, other):
+        for key, counter in other.values.items():
+            self.values.setdefault(key, ValueCounter()).merge(counter)
+            self._medians.pop(_as_tuple(key), None)
+        self.missing = _merge_counts(self.missing, other.missing)
+        return self
+
+    def medians(self):
+        """Медианы групп (пересчитываются только для групп, изменившихся после прошлого вызова)"""
+        for key, counter in self.values.items():
+            key = _as_tuple(key)
+            if key not in self._medians:
+                self._medians[key] = counter.median()
+        return {_as_tuple(key): self._medians[_as_tuple(key)] for key in self.values}
+
+    def to_imputer(self):
+        """GroupImputer с медианами групп по накопленным гистограммам"""
+        medians = self.medians()
+        keys = sorted(medians)
+        if len(self.group_columns) == 1:
+            index = pd.Index([key[0] for key in keys], name=self.group_columns[0])
+        else:
+            index = pd.MultiIndex.from_tuples(keys, names=self.group_columns)
+        imputer = GroupImputer(self.value_column, self.group_columns, 'median')
+        imputer.stats_ = pd.Series([medians[key] for key in keys], index=index, name=self.value_column,
+                                   dtype='float64')
+        return imputer
+
+    def filled_counter(self):
+        """Гистограмма столбца после заполнения пропусков медианами групп"""
+        total = ValueCounter()
+        for counter in self.values.values():
+            total.merge(counter)
+        medians = self.medians()
+        for key, count in self.missing.items():
+            total.add(medians.get(_as_tuple(key), np.nan), int(count))
+        return total
+
+    @property
+    def missing_total(self):
+        return int(self.missing.sum())
+
+    @property
+    def filled_total(self):
+        medians = self.medians()
+        return int(sum(count for key, count in self.missing.items()
+                       if not pd.isna(medians.get(_as_tuple(key), np.nan))))
+
+
+def fit_clipper(counters, clipper=None):
+    """Обучение OutlierClipper по гистограммам исходных столбцов {столбец: ValueCounter}.
+
+    Границы совпадают с OutlierClipper.fit() на тех же значениях.
+    """
+    if clipper is None:
+        clipper = OutlierClipper()
+    clipper.stats_ = {}
+    for source, output, func, clip in clipper.specs:
+        if clip is None:
+            continue
+        counter = counters[source] if func is None else counters[source].apply(func)
+        clipper.stats_[output] = tuple(float(x) for x in sketch_bounds(counter, clipper.multiplier))
+    return clipper
+
+
+class StreamingProfile:
+    """Объединяемое состояние потокового анализа (разделы 2 и 3 lab1.py)"""
+
+    def __init__(self):
+        self.n_rows = 0
+        self.first_rows = None
+        self.report = None
+        self.survived_sum = 0
+        self.survived_count = 0
+        self.sex_values = {}
+        self.fare_zero_by_class = GroupSurvival()
+        self.age_imputer = GroupMedianImputer('Age', ['Sex', 'Pclass'])
+        self.fare_imputer = GroupMedianImputer('Fare', ['Pclass'])
+        self.counters = {col: ValueCounter() for col in NUMERIC_COLUMNS if col not in ('Age', 'Fare')}
+        self.survival_by_class = GroupSurvival()
+        self.survival_by_sex = GroupSurvival()
+
+    def update(self, chunk):
+        if self.first_rows is None:
+            self.first_rows = chunk.head()
+        self.n_rows += len(chunk)
+
+        # Раздел 2: пропуски, нули, аномальные значения
+        report = profile_frame(chunk)
+        self.report = report if self.report is None else self.report.merge(report)
+        self.survived_sum += chunk['Survived'].sum()
+        self.survived_count += chunk['Survived'].count()
+        fare_zero = chunk[chunk['Fare'] == 0]
+        if len(fare_zero) > 0:
+            self.fare_zero_by_class.update(fare_zero['Pclass'], fare_zero['Survived'])
+
+        # Раздел 2.1: состояние для импутации медианами групп
+        self.age_imputer.update(chunk)
+        self.fare_imputer.update(chunk)
+
+        # Раздел 3: статистики обработанных данных
+        for col, counter in self.counters.items():
+            counter.update(chunk[col])
+        sex = chunk['Sex'].fillna('Unknown')
+        for value in sex.unique():
+            self.sex_values.setdefault(value, None)
+        self.survival_by_class.update(chunk['Pclass'], chunk['Survived'])
+        self.survival_by_sex.update(sex, chunk['Survived'])
+        return self
+
+    def merge(self, other):
+        """Объединение с состоянием, накопленным по другой части файла"""
+        if self.first_rows is None:
+            self.first_rows = other.first_rows
+        self.n_rows += other.n_rows
+        if other.report is not None:
+            self.report = other.report if self.report is None else self.report.merge(other.report)
+        self.survived_sum += other.survived_sum
+        self.survived_count += other.survived_count
+        for value in other.sex_values:
+            self.sex_values.setdefault(value, None)
+        self.fare_zero_by_class.merge(other.fare_zero_by_class)
+        self.age_imputer.merge(other.age_imputer)
+        self.fare_imputer.merge(other.fare_imputer)
+        for col, counter in self.counters.items():
+            counter.merge(other.counters[col])
+        self.survival_by_class.merge(other.survival_by_class)
+        self.survival_by_sex.merge(other.survival_by_sex)
+        return self
+
+    def describe(self):
+        """Аналог df_processed.describe() после заполнения пропусков"""
+        counters = dict(self.counters)
+        counters['Age'] = self.age_imputer.filled_counter()
+        counters['Fare'] = self.fare_imputer.filled_counter()
+        return pd.DataFrame({col: counters[col].describe() for col in NUMERIC_COLUMNS})
+
+
+def read_chunks(path, chunksize=CHUNK_SIZE, **kwargs):
+    """Итератор по частям CSV-файла с фиксированными типами текстовых полей"""
+    dtype = {col: object for col in TEXT_COLUMNS}
+    return pd.read_csv(path, chunksize=chunksize, dtype=dtype, **kwargs)
+
+
+def profile_csv(path, chunksize=CHUNK_SIZE):
+    """Однопроходное накопление StreamingProfile по CSV-файлу"""
+    profile = StreamingProfile()
+    for chunk in read_chunks(path, chunksize):
+        profile.update(chunk)
+    return profile
+
+
+def print_streaming_report(profile):
+    """Вывод разделов 2 и 3 в том же виде, что и lab1.py"""
+    n = profile.n_rows
+
+    print(f"Размер датасета: {n} строк, {len(profile.first_rows.columns)} столбцов")
+
+    print("\n\n2. АНАЛИЗ ПРОПУЩЕННЫХ И НУЛЕВЫХ ЗНАЧЕНИЙ")
+    print("-" * 40)
+    print("Детальный анализ данных на наличие пропусков и нулевых значений:")
+
+    report = profile.report
+    print_report(report)
+    nan_counts = report.table['nan']
+
+    fare_zero_table = profile.fare_zero_by_class.table()
+    if len(fare_zero_table) > 0:
+        print(f"\n4. АНАЛИЗ БЕСПЛАТНЫХ БИЛЕТОВ (Fare = 0):")
+        print(f"  Всего бесплатных билетов: {fare_zero_table['count'].sum()}")
+        print(f"  Распределение по классам:")
+        for pclass, row in fare_zero_table.iterrows():
+            print(f"    Класс {pclass}: {row['count']:.0f} билетов, выживаемость: {row['mean']:.2%}")
+        fare_zero_stats = profile.fare_zero_by_class.stats
+        print(f"  Выживаемость с бесплатными билетами: "
+              f"{fare_zero_stats['sum'].sum() / fare_zero_stats['count'].sum():.2%}")
+        print(f"  Общая выживаемость: {profile.survived_sum / profile.survived_count:.2%}")
+
+    print("\n5. Детальный анализ столбца Age:")
+    age_missing = nan_counts['Age']
+    print(f"  Пропущенных значений (NaN): {age_missing}")
+    print(f"  Заполненных значений: {n - age_missing}")
+    print(f"  Процент пропусков: {age_missing/n*100:.2f}%")
+
+    if nan_counts.sum() == 0:
+        print("\n✅ Пропущенных значений (NaN) не обнаружено")
+
+    print("\n\n2.1. ОБРАБОТКА ПРОПУЩЕННЫХ ЗНАЧЕНИЙ")
+    print("-" * 40)
+    if nan_counts['Age'] > 0:
+        print(f"✓ Заполнено пропусков в Age: {profile.age_imputer.filled_total}")
+    if nan_counts['Fare'] > 0:
+        print(f"✓ Заполнено пропусков в Fare: {profile.fare_imputer.filled_total}")
+    for col in TEXT_COLUMNS:
+        if nan_counts[col] > 0:
+            print(f"✓ Заполнены пропуски в {col}")
+    print("✅ Все пропущенные значения обработаны")
+
+    print("\n\n3. СТАТИСТИЧЕСКИЙ АНАЛИЗ")
+    print("-" * 40)
+    print("Основные статистики (числовые признаки):")
+    print(profile.describe())
+
+    print("\nКатегориальные признаки:")
+    print(f"Уникальные значения в 'Sex': {np.array(list(profile.sex_values), dtype=object)}")
+    print(f"Уникальные значения в 'Pclass': {sorted(profile.survival_by_class.stats.index.to_numpy())}")
+
+    print("\nАНАЛИЗ ВЫЖИВАЕМОСТИ:")
+    survival_rate = profile.survived_sum / profile.survived_count
+    print(f"Общая выживаемость: {survival_rate:.2%} ({profile.survived_sum}/{n})")
+
+    print("\nВыживаемость по классам:")
+    survival_by_class = profile.survival_by_class.table()
+    survival_by_class.index.name = 'Pclass'
+    survival_by_class['mean_pct'] = survival_by_class['mean'].apply(lambda x: f"{x:.2%}")
+    print(survival_by_class[['mean_pct', 'count']].rename(columns={'mean_pct': 'Выживаемость', 'count': 'Количество'}))
+
+    print("\nВыживаемость по полу:")
+    survival_by_sex = profile.survival_by_sex.table()
+    survival_by_sex.index.name = 'Sex'
+    survival_by_sex['mean_pct'] = survival_by_sex['mean'].apply(lambda x: f"{x:.2%}")
+    print(survival_by_sex[['mean_pct', 'count']].rename(columns={'mean_pct': 'Выживаемость', 'count': 'Количество'}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Потоковый анализ данных Титаника по частям')
+    parser.add_argument('path', nargs='?', default='titanic.csv', help='входной CSV-файл')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help='размер части (строк)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ЛАБОРАТОРНАЯ РАБОТА: АНАЛИЗ ДАННЫХ ТИТАНИКА (ПОТОКОВЫЙ РЕЖИМ)")
+    print("=" * 60)
+    print_streaming_report(profile_csv(args.path, args.chunksize))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Повторный запуск lab1.main() с тем же каталогом кэша"""
+import re
+
+import lab1
+
+
+def _run(tmp_path, capsys):
+    lab1.main('titanic.csv', str(tmp_path / 'processed.csv'), figures_dir=str(tmp_path / 'figures'),
+              cache_dir=str(tmp_path / 'cache'))
+    hits, misses = re.search(r'попаданий (\d+), промахов (\d+)', capsys.readouterr().out).groups()
+    return int(hits), int(misses)
+
+
+def test_warm_run_hits_cache_and_writes_same_output(tmp_path, capsys):
+    output = tmp_path / 'processed.csv'
+    hits, misses = _run(tmp_path, capsys)
+    assert hits == 0 and misses > 0
+    cold = output.read_bytes()
+
+    # Без выходного файла итоговая таблица берётся из кэша и записывается заново
+    output.unlink()
+    hits, misses = _run(tmp_path, capsys)
+    assert misses == 0 and hits > 0
+    assert output.read_bytes() == cold
+
+    # Неизменный выходной файл не перезаписывается
+    modified = output.stat().st_mtime_ns
+    hits, misses = _run(tmp_path, capsys)
+    assert misses == 0
+    assert output.stat().st_mtime_ns == modified
+    assert output.read_bytes() == cold
@@ -0,0 +1,47 @@
+"""Проверка срезов и свёрток SurvivalCube по группировкам pandas"""
+import numpy as np
+import pytest
+
+import lab1
+from cube import SurvivalCube
+
+
+@pytest.fixture(scope='module')
+def processed():
+    return lab1.run_pipeline(lab1.load_data('titanic.csv'))
+
+
+@pytest.fixture(scope='module')
+def cube(processed):
+    return SurvivalCube.from_frame(processed)
+
+
+def _expected(df, by):
+    return df.groupby(by, observed=True)['Survived'].agg(['mean', 'count'])
+
+
+def _check(table, expected):
+    assert list(table.index) == list(expected.index)
+    np.testing.assert_allclose(table['mean'], expected['mean'])
+    np.testing.assert_array_equal(table['count'], expected['count'])
+
+
+def test_table_matches_groupby(cube, processed):
+    _check(cube.table(['Pclass', 'Sex']), _expected(processed, ['Pclass', 'Sex']))
+
+
+def test_filter_on_other_dimension(cube, processed):
+    _check(cube.table('Sex', Pclass=1), _expected(processed[processed['Pclass'] == 1], 'Sex'))
+
+
+@pytest.mark.parametrize('value', [2, [1, 2]])
+def test_filter_on_by_dimension(cube, processed, value):
+    values = value if isinstance(value, list) else [value]
+    subset = processed[processed['Pclass'].isin(values)]
+    _check(cube.table('Pclass', Pclass=value), _expected(subset, 'Pclass'))
+    _check(cube.table(['Sex', 'Pclass'], Pclass=value), _expected(subset, ['Sex', 'Pclass']))
+
+
+def test_totals(cube, processed):
+    subset = processed[(processed['Pclass'] == 3) & (processed['Sex'] == 'female')]
+    assert cube.totals(Pclass=3, Sex='female') == (int(subset['Survived'].sum()), len(subset))
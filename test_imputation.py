@@ -0,0 +1,54 @@
+"""Проверка GroupImputer по групповым лямбдам исходного lab1.py"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from imputation import GroupImputer, load_imputers, save_imputers
+
+LAMBDAS = {
+    'median': lambda x: x.fillna(x.median()),
+    'mean': lambda x: x.fillna(x.mean()),
+    'mode': lambda x: x.fillna(x.mode()[0]) if x.notna().any() else x,
+    'constant': lambda x: x.fillna(-1.0),
+}
+
+
+def _imputer(strategy, by=('Sex', 'Pclass')):
+    return GroupImputer('Age', by, strategy, fill_value=-1.0 if strategy == 'constant' else None)
+
+
+@pytest.fixture
+def frame():
+    df = pd.read_csv('titanic.csv')
+    # Округлённый возраст, чтобы у моды групп были повторы; часть значений - пропуски
+    df['Age'] = df['Age'].round()
+    df.loc[df.sample(frac=0.2, random_state=0).index, 'Age'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('strategy', ['median', 'mean', 'mode', 'constant'])
+def test_matches_group_lambda(frame, strategy):
+    expected = frame.groupby(['Sex', 'Pclass'])['Age'].transform(LAMBDAS[strategy])
+    result = _imputer(strategy).fit_transform(frame)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_missing_group_key_keeps_value(frame):
+    known = frame.index[frame['Age'].notna()][0]        # значение Age есть
+    unknown = frame.index[frame['Age'].isna()][0]       # пропуск, группа неизвестна
+    frame.loc[[known, unknown], 'Sex'] = np.nan
+    result = _imputer('median').fit_transform(frame)
+    # groupby().transform() дал бы NaN и для known; импутер не трогает заполненные значения
+    assert result[known] == frame.loc[known, 'Age']
+    assert np.isnan(result[unknown])
+    assert result.drop([known, unknown]).notna().all()
+
+
+@pytest.mark.parametrize('strategy', ['median', 'mean', 'mode', 'constant'])
+@pytest.mark.parametrize('by', [['Sex', 'Pclass'], ['Pclass'], []])
+def test_json_round_trip(frame, tmp_path, strategy, by):
+    imputer = _imputer(strategy, by).fit(frame)
+    path = tmp_path / 'imputers.json'
+    save_imputers([imputer], path)
+    loaded, = load_imputers(path)
+    pd.testing.assert_series_equal(loaded.transform(frame), imputer.transform(frame))
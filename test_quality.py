@@ -0,0 +1,85 @@
+"""Проверка правил качества и индекса нарушений"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from quality import (CrossRule, DomainRule, NotNullRule, RangeRule, RegexRule, RuleSet, Violations,
+                     check_rules)
+
+RULES = [
+    DomainRule('Pclass', [1, 2, 3]),
+    RangeRule('Age', low=0, high=100, inclusive='right'),
+    DomainRule('Sex', ['male', 'female']),
+    RegexRule('Name', r'[^.\s]+\.\s+\S.*'),
+    NotNullRule('Name'),
+    CrossRule('Infant_alone', ['Age', 'Parents'], lambda age, parents: (age < 5) & (parents == 0)),
+]
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'Pclass': [1, 2, 5, np.nan, 3, 3, 1, 2, 3, 1],
+        'Age': [30, 0, 40, 101, np.nan, 2, 2, 50, -1, 20],
+        'Sex': ['male', 'female', 'male', None, 'x', 'female', 'male', 'male', 'female', 'female'],
+        'Name': ['Mr. A B', 'Mrs. C D', 'Mr. E', 'Miss. F', 'bad', None, 'Mr. G', 'Dr. H', 'Ms. I', 'Mr. J'],
+        'Parents': [0, 1, 0, 0, 1, 0, 1, 0, 2, 0],
+    })
+
+
+def test_masks(frame):
+    violations = check_rules(frame, RULES)
+    expected = {
+        'Pclass_domain': [2, 3],     # NaN - не из списка допустимых значений
+        'Age_range': [1, 3, 8],      # пропуск Age нарушением не считается
+        'Sex_domain': [3, 4],
+        'Name_format': [4],
+        'Name_notnull': [5],
+        'Infant_alone': [5],
+    }
+    for name, rows in expected.items():
+        np.testing.assert_array_equal(violations.rows(name), rows)
+    np.testing.assert_array_equal(violations.rows(), [1, 2, 3, 4, 5, 8])
+    assert violations.counts.to_dict() == {name: len(rows) for name, rows in expected.items()}
+
+
+def test_categorical_matches_object(frame):
+    categorical = frame.astype({'Sex': 'category', 'Name': 'category'})
+    left, right = check_rules(frame, RULES), check_rules(categorical, RULES)
+    np.testing.assert_array_equal(left.matrix(), right.matrix())
+
+
+def test_bitmaps_are_packed(frame):
+    violations = check_rules(frame, RULES)
+    assert violations.bitmaps.dtype == np.uint8
+    assert violations.bitmaps.shape == (len(RULES), 2)
+    np.testing.assert_array_equal(violations.matrix()[0], violations.mask('Pclass_domain'))
+    restored = Violations.from_dict(violations.to_dict())
+    np.testing.assert_array_equal(restored.bitmaps, violations.bitmaps)
+
+
+@pytest.mark.parametrize('size', [8, 3, 7])
+def test_concat_matches_whole_frame(frame, size):
+    frame = pd.concat([frame] * 5, ignore_index=True)
+    rules = RuleSet(RULES)
+    whole = rules.check(frame)
+    parts = [rules.check(frame.iloc[start:start + size]) for start in range(0, len(frame), size)]
+    joined = Violations.concat(parts)
+    assert joined.n_rows == whole.n_rows
+    np.testing.assert_array_equal(joined.bitmaps, whole.bitmaps)
+    np.testing.assert_array_equal(parts[0].merge(parts[1]).matrix(), rules.check(frame.iloc[:2 * size]).matrix())
+
+
+def test_concat_rejects_different_rules(frame):
+    with pytest.raises(ValueError):
+        Violations.concat([check_rules(frame, RULES), check_rules(frame, RULES[:2])])
+
+
+def test_filter_and_quarantine(frame):
+    violations = check_rules(frame, RULES)
+    clean, rejected = violations.filter(frame), violations.quarantine(frame)
+    assert list(clean.index) == [0, 6, 7, 9]
+    assert list(rejected.index) == [1, 2, 3, 4, 5, 8]
+    assert rejected.loc[3, 'Нарушения'] == 'Pclass_domain, Age_range, Sex_domain'
+    assert rejected.loc[5, 'Нарушения'] == 'Name_notnull, Infant_alone'
+    assert len(clean) + len(rejected) == len(frame)
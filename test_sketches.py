@@ -0,0 +1,39 @@
+"""Проверка скетча KLL: точный режим и ошибка ранга после сжатия"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sketches import KLLSketch
+
+QUANTILES = [0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+@pytest.mark.parametrize('chunk', [7, 50, 200])
+def test_exact_until_compaction(chunk):
+    values = pd.Series(np.random.default_rng(0).normal(30, 14, 200).round(1))
+    values[::9] = np.nan
+    sketch = KLLSketch()
+    for start in range(0, len(values), chunk):
+        sketch.update(values.iloc[start:start + chunk])
+    assert sketch.exact and sketch.rank_error == 0
+    assert sketch.n == values.count()
+    assert sketch.median() == values.median()
+    for q in QUANTILES:
+        assert sketch.quantile(q) == values.quantile(q)
+
+
+@pytest.mark.parametrize('error', [0.01, 0.05])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_rank_error_within_bound(error, seed):
+    values = np.random.default_rng(seed).lognormal(3, 1, 100_000)
+    sketch = KLLSketch(error, seed=seed)
+    for part in np.array_split(values, 37):
+        sketch.update(part)
+    assert not sketch.exact and sketch.rank_error <= error
+    ordered = np.sort(values)
+    for q in QUANTILES[1:-1] + [0.05, 0.33, 0.95]:
+        estimate = sketch.quantile(q)
+        # Доли значений строго меньше и не больше оценки охватывают её ранг
+        low = np.searchsorted(ordered, estimate, side='left') / len(values)
+        high = np.searchsorted(ordered, estimate, side='right') / len(values)
+        assert low - sketch.rank_error <= q <= high + sketch.rank_error